@@ -2,15 +2,117 @@
 
 import re
 import json
+import asyncio
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
-from collections import Counter, defaultdict
+from collections import Counter
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
+import orjson
+import pandas as pd
+from drain3 import TemplateMiner
+from drain3.template_miner_config import TemplateMinerConfig
+
+try:
+  # Use Intel oneDAL's IsolationForest when scikit-learn-intelex is available
+  from sklearnex import patch_sklearn
+  patch_sklearn(["IsolationForest"])
+except ImportError:
+  pass
+
 from sklearn.ensemble import IsolationForest
 from sklearn.preprocessing import StandardScaler
-from app.agents.base import BaseAgent, Anomaly, AnalysisResult
+from app.agents.base import BaseAgent, Anomaly, AnalysisResult, _mk_anomaly
 from app.llm.manager import LLMManager
-from app.llm.base import LLMMessage
+from app.llm.base import LLMMessage, LLMResponse
+from app.llm.cache import cached_generate
+from app.llm.semantic_cache import semantic_cached_generate
+
+
+ERROR_KEYWORDS_PATTERN = re.compile(r"ERROR|EXCEPTION|FAILED|FATAL", re.IGNORECASE)
+JSON_OBJECT_PATTERN = re.compile(r"\{.*\}", re.DOTALL)
+SEVERITIES = {"low", "medium", "high", "critical"}
+
+_json_decoder = json.JSONDecoder()
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+# System prompts are constant, so their messages are built once and shared by every call
+SEMANTIC_SYSTEM_MESSAGE = LLMMessage(
+  role="system",
+  content="""You are an expert log analyst. Analyze the following log entries for anomalies, errors, or suspicious patterns.
+Look for:
+1. Error messages or exceptions
+2. Unusual patterns in requests or responses
+3. Security-related issues
+4. Performance problems
+5. Configuration issues
+
+Return your analysis in JSON format with anomalies array containing severity, category, description, and confidence."""
+)
+
+PATTERN_SYSTEM_MESSAGE = LLMMessage(
+  role="system",
+  content="Analyze log patterns and identify anomalies. Look for unusual patterns in error rates, frequency changes, or other indicators of problems."
+)
+
+SUMMARY_SYSTEM_MESSAGE = LLMMessage(
+  role="system",
+  content="Generate a concise summary of log analysis results, highlighting key findings and overall system health."
+)
+
+RECOMMENDATION_SYSTEM_MESSAGE = LLMMessage(
+  role="system",
+  content="Generate actionable recommendations for addressing the detected anomalies."
+)
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+  """Get the shared process pool for CPU-bound detection, creating it on first use."""
+  global _process_pool
+  if _process_pool is None:
+    # One process is enough, as the forest fit already uses every core. Spawned
+    # rather than forked, since callers such as the Celery worker have threads
+    # running that may hold locks
+    _process_pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+  return _process_pool
+
+
+def shutdown_process_pool() -> None:
+  """Shut down the shared process pool, if it was started."""
+  global _process_pool
+  if _process_pool is not None:
+    _process_pool.shutdown()
+    _process_pool = None
+
+
+def _dumps(obj: Any) -> str:
+  """Serialize to indented JSON for prompts."""
+  return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY).decode()
+
+
+def _extract_json(text: str) -> Optional[Any]:
+  """Extract the JSON object embedded in an LLM response."""
+  match = JSON_OBJECT_PATTERN.search(text)
+  if not match:
+    return None
+  
+  try:
+    return orjson.loads(match.group(0))
+  except orjson.JSONDecodeError:
+    pass
+  
+  # Surrounding text contains stray braces (or non-standard JSON such as NaN):
+  # decode forward from each opening brace until an object parses on its own
+  pos = match.start()
+  while pos != -1:
+    try:
+      return _json_decoder.raw_decode(text, pos)[0]
+    except ValueError:
+      pos = text.find("{", pos + 1)
+  
+  return None
 
 
 class AnomalyDetectorAgent(BaseAgent):
@@ -36,27 +138,46 @@ class AnomalyDetectorAgent(BaseAgent):
         metrics={}
       )
     
-    # Initialize LLM manager
-    llm_manager = LLMManager()
+    # Convert the entries to columns once; the list of dicts is only kept for LLM prompt samples
+    columns = self._extract_columns(data)
     
-    # Perform statistical analysis
-    statistical_anomalies = self._detect_statistical_anomalies(data)
+    # Too few entries for statistical analysis to run or to be worth an LLM round-trip
+    if len(data) < self.config.get("llm_min_entries", 10):
+      return AnalysisResult(
+        anomalies=[],
+        summary=self._default_summary(data, []),
+        recommendations=["No anomalies detected. System appears healthy."],
+        metrics=self._calculate_metrics(columns, [])
+      )
     
-    # Perform pattern analysis
-    pattern_anomalies = await self._detect_pattern_anomalies(data, llm_manager)
+    # Initialize LLM manager
+    llm_manager = LLMManager()
     
-    # Perform semantic analysis
-    semantic_anomalies = await self._detect_semantic_anomalies(data, llm_manager)
+    if self._use_batch_mode(data):
+      try:
+        return await self._analyze_batched(data, columns, llm_manager)
+      except Exception as e:
+        print(f"LLM batch analysis failed, falling back to real-time: {e}")
+    
+    # Run statistical, pattern and semantic analysis concurrently; the
+    # statistical path runs off the event loop while the LLM calls are in flight
+    statistical_anomalies, pattern_anomalies, semantic_anomalies = await asyncio.gather(
+      self._run_statistical_detection(columns),
+      self._detect_pattern_anomalies(data, columns, llm_manager),
+      self._detect_semantic_anomalies(data, llm_manager)
+    )
     
     # Combine all anomalies
     all_anomalies = statistical_anomalies + pattern_anomalies + semantic_anomalies
     
     # Generate summary and recommendations
-    summary = await self._generate_summary(data, all_anomalies, llm_manager)
-    recommendations = await self._generate_recommendations(all_anomalies, llm_manager)
+    summary, recommendations = await asyncio.gather(
+      self._generate_summary(data, all_anomalies, llm_manager),
+      self._generate_recommendations(all_anomalies, llm_manager)
+    )
     
     # Calculate metrics
-    metrics = self._calculate_metrics(data, all_anomalies)
+    metrics = self._calculate_metrics(columns, all_anomalies)
     
     return AnalysisResult(
       anomalies=all_anomalies,
@@ -65,62 +186,149 @@ class AnomalyDetectorAgent(BaseAgent):
       metrics=metrics
     )
   
-  def _detect_statistical_anomalies(self, data: List[Dict[str, Any]]) -> List[Anomaly]:
-    """Detect statistical anomalies."""
-    anomalies = []
+  def _use_batch_mode(self, data: List[Dict[str, Any]]) -> bool:
+    """Check whether LLM calls should go through the provider batch API."""
+    return bool(self.config.get("batch_mode")) and len(data) >= self.config.get("batch_min_entries", 1000)
+  
+  async def _analyze_batched(
+    self,
+    data: List[Dict[str, Any]],
+    columns: Dict[str, Any],
+    llm_manager: LLMManager
+  ) -> AnalysisResult:
+    """Analyze log data submitting LLM prompts as provider batches."""
+    # Pattern and semantic prompts go out as one batch
+    requests = {}
     
-    # Extract numerical features
-    features = self._extract_features(data)
+    error_patterns = self._analyze_error_patterns(columns)
+    frequency_anomalies = self._analyze_frequency_patterns(columns)
+    if error_patterns or frequency_anomalies:
+      requests["pattern"] = self._pattern_messages(data, error_patterns, frequency_anomalies)
     
-    if len(features) < 10:  # Need minimum data for statistical analysis
-      return anomalies
+    text_samples = self._extract_text_samples(data)
+    if text_samples:
+      templates = await asyncio.to_thread(self._extract_templates, text_samples)
+      requests["semantic"] = self._semantic_messages(templates)
+    
+    statistical_anomalies, responses = await asyncio.gather(
+      self._run_statistical_detection(columns),
+      self._generate_batch(requests, llm_manager)
+    )
+    
+    all_anomalies = list(statistical_anomalies)
+    for request_id in requests:
+      if request_id in responses:
+        all_anomalies.extend(self._parse_llm_response(responses[request_id].content))
+    
+    # Summary and recommendations depend on the anomalies, so they form a second batch
+    requests = {"summary": self._summary_messages(data, all_anomalies)}
+    if all_anomalies:
+      requests["recommendations"] = self._recommendation_messages(all_anomalies)
     
-    # Convert to numpy array
-    X = np.array(features)
+    responses = await self._generate_batch(requests, llm_manager)
+    
+    if "summary" in responses:
+      summary = responses["summary"].content
+    else:
+      summary = self._default_summary(data, all_anomalies)
+    
+    if not all_anomalies:
+      recommendations = ["No anomalies detected. System appears healthy."]
+    elif "recommendations" in responses:
+      recommendations = self._parse_recommendations(responses["recommendations"].content)
+    else:
+      recommendations = ["Review detected anomalies and take appropriate action."]
+    
+    return AnalysisResult(
+      anomalies=all_anomalies,
+      summary=summary,
+      recommendations=recommendations,
+      metrics=self._calculate_metrics(columns, all_anomalies)
+    )
+  
+  async def _generate_batch(
+    self,
+    requests: Dict[str, List[LLMMessage]],
+    llm_manager: LLMManager
+  ) -> Dict[str, LLMResponse]:
+    """Submit a batch of prompts to the configured provider."""
+    if not requests:
+      return {}
+    
+    return await llm_manager.generate_batch(
+      requests=requests,
+      provider_name=self.config["llm_provider"],
+      temperature=0.3
+    )
+  
+  async def _run_statistical_detection(self, columns: Dict[str, Any]) -> List[Anomaly]:
+    """Run statistical detection without blocking the event loop."""
+    # When enabled, large inputs go to a worker process so the forest fit doesn't
+    # compete with the event loop thread for the GIL
+    min_entries = self.config.get("process_pool_min_entries")
+    if min_entries is not None and len(columns["text"]) >= min_entries:
+      loop = asyncio.get_running_loop()
+      return await loop.run_in_executor(_get_process_pool(), self._detect_statistical_anomalies, columns)
+    
+    return await asyncio.to_thread(self._detect_statistical_anomalies, columns)
+  
+  def _detect_statistical_anomalies(self, columns: Dict[str, Any]) -> List[Anomaly]:
+    """Detect statistical anomalies."""
+    if len(columns["text"]) < 10:  # Need minimum data for statistical analysis
+      return []
+    
+    # Extract numerical features
+    features = self._extract_features(columns)
     
     # Apply isolation forest
     iso_forest = IsolationForest(
       contamination=self._get_contamination_level(),
-      random_state=42
+      random_state=42,
+      n_jobs=-1,
+      **self._get_forest_params()
     )
     
-    anomaly_labels = iso_forest.fit_predict(X)
-    anomaly_scores = iso_forest.decision_function(X)
-    
-    # Create anomalies from detected outliers
-    for i, (label, score) in enumerate(zip(anomaly_labels, anomaly_scores)):
-      if label == -1:  # Anomaly detected
-        severity = self._calculate_severity(score)
-        
-        anomaly = Anomaly(
-          severity=severity,
-          category="statistical_outlier",
-          description=f"Statistical anomaly detected with score: {score:.3f}",
-          confidence=abs(score),
-          data={
-            "row_index": i,
-            "features": features[i],
-            "anomaly_score": float(score)
-          },
-          detected_at=datetime.utcnow()
-        )
-        anomalies.append(anomaly)
+    # Fit once and derive labels from the scores instead of traversing the trees twice
+    iso_forest.fit(features)
+    anomaly_scores = iso_forest.decision_function(features)
+    anomaly_labels = np.where(anomaly_scores < 0, -1, 1)
+    severities = self._calculate_severity(anomaly_scores)
+    
+    # Create anomalies from detected outliers; scores come straight from the
+    # model so validation is skipped
+    detected_at = datetime.utcnow()
+    anomalies = [
+      _mk_anomaly(
+        severity=str(severities[i]),
+        category="statistical_outlier",
+        description=f"Statistical anomaly detected with score: {anomaly_scores[i]:.3f}",
+        confidence=float(abs(anomaly_scores[i])),
+        data={
+          "row_index": int(i),
+          "features": features[i].tolist(),
+          "anomaly_score": float(anomaly_scores[i])
+        },
+        detected_at=detected_at
+      )
+      for i in np.flatnonzero(anomaly_labels == -1)
+    ]
     
     return anomalies
   
   async def _detect_pattern_anomalies(
     self, 
     data: List[Dict[str, Any]], 
+    columns: Dict[str, Any],
     llm_manager: LLMManager
   ) -> List[Anomaly]:
     """Detect pattern-based anomalies using LLM."""
     anomalies = []
     
     # Analyze error patterns
-    error_patterns = self._analyze_error_patterns(data)
+    error_patterns = self._analyze_error_patterns(columns)
     
     # Analyze frequency patterns
-    frequency_anomalies = self._analyze_frequency_patterns(data)
+    frequency_anomalies = self._analyze_frequency_patterns(columns)
     
     # Use LLM for complex pattern analysis
     if error_patterns or frequency_anomalies:
@@ -142,6 +350,9 @@ class AnomalyDetectorAgent(BaseAgent):
     """Detect semantic anomalies using LLM."""
     anomalies = []
     
+    if not data:
+      return anomalies
+    
     # Extract text content for analysis
     text_samples = self._extract_text_samples(data)
     
@@ -149,28 +360,14 @@ class AnomalyDetectorAgent(BaseAgent):
       return anomalies
     
     # Use LLM to analyze semantic content
-    messages = [
-      LLMMessage(
-        role="system",
-        content="""You are an expert log analyst. Analyze the following log entries for anomalies, errors, or suspicious patterns. 
-        Look for:
-        1. Error messages or exceptions
-        2. Unusual patterns in requests or responses
-        3. Security-related issues
-        4. Performance problems
-        5. Configuration issues
-        
-        Return your analysis in JSON format with anomalies array containing severity, category, description, and confidence."""
-      ),
-      LLMMessage(
-        role="user",
-        content=f"Analyze these log entries:\n\n{json.dumps(text_samples[:50], indent=2)}"
-      )
-    ]
+    # Collapse near-duplicate lines into templates so rare lines reach the prompt
+    templates = await asyncio.to_thread(self._extract_templates, text_samples)
+    messages = self._semantic_messages(templates)
     
     try:
-      response = await llm_manager.generate_response(
-        messages=messages,
+      response = await semantic_cached_generate(
+        llm_manager,
+        messages,
         provider_name=self.config["llm_provider"],
         temperature=0.3
       )
@@ -184,106 +381,100 @@ class AnomalyDetectorAgent(BaseAgent):
     
     return anomalies
   
-  def _extract_features(self, data: List[Dict[str, Any]]) -> List[List[float]]:
-    """Extract numerical features from log data."""
-    features = []
-    
-    for entry in data:
-      feature_vector = []
-      
-      # Extract timestamp-based features
-      if "timestamp" in entry:
-        try:
-          # Convert timestamp to hour of day, day of week, etc.
-          ts = datetime.fromisoformat(entry["timestamp"].replace("Z", "+00:00"))
-          feature_vector.extend([
-            ts.hour,
-            ts.weekday(),
-            ts.day,
-            ts.month
-          ])
-        except:
-          feature_vector.extend([0, 0, 0, 0])
-      else:
-        feature_vector.extend([0, 0, 0, 0])
-      
-      # Extract status code features
-      if "status" in entry:
-        status = int(entry["status"]) if str(entry["status"]).isdigit() else 0
-        feature_vector.append(status)
-        feature_vector.append(1 if 400 <= status < 500 else 0)  # Client error
-        feature_vector.append(1 if 500 <= status < 600 else 0)  # Server error
-      else:
-        feature_vector.extend([0, 0, 0])
-      
-      # Extract response time features
-      if "response_time" in entry:
-        try:
-          response_time = float(entry["response_time"])
-          feature_vector.append(response_time)
-        except:
-          feature_vector.append(0)
-      else:
-        feature_vector.append(0)
-      
-      # Extract text length features
-      text_content = str(entry.get("message", "")) + str(entry.get("request", ""))
-      feature_vector.append(len(text_content))
-      feature_vector.append(text_content.count("ERROR"))
-      feature_vector.append(text_content.count("WARN"))
-      feature_vector.append(text_content.count("FATAL"))
-      
-      features.append(feature_vector)
+  def _semantic_messages(self, templates: List[Dict[str, Any]]) -> List[LLMMessage]:
+    """Build messages for semantic analysis."""
+    return [
+      SEMANTIC_SYSTEM_MESSAGE,
+      LLMMessage(
+        role="user",
+        content=(
+          "Analyze these log templates (rarest first, with occurrence count and an example line):"
+          f"\n\n{_dumps(templates)}"
+        )
+      )
+    ]
+  
+  def _parse_timestamps(self, data: List[Dict[str, Any]]) -> pd.Series:
+    """Parse entry timestamps as UTC; missing or unparseable values become NaT."""
+    return pd.to_datetime(
+      pd.Series([entry.get("timestamp") for entry in data], dtype=object),
+      format="ISO8601",
+      errors="coerce",
+      utc=True
+    )
+  
+  def _extract_columns(self, data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Convert log entries into the column arrays shared by the numeric analysis."""
+    df = pd.DataFrame(data, columns=["status", "response_time", "message", "request"])
     
-    return features
+    return {
+      "timestamp": self._parse_timestamps(data),
+      "status": pd.to_numeric(df["status"], errors="coerce").fillna(0).to_numpy(np.int32),
+      "response_time": pd.to_numeric(df["response_time"], errors="coerce").fillna(0).to_numpy(np.float32),
+      "text": df["message"].fillna("").astype(str) + df["request"].fillna("").astype(str)
+    }
+  
+  def _extract_features(self, columns: Dict[str, Any]) -> np.ndarray:
+    """Extract numerical features from log data."""
+    X = np.empty((len(columns["text"]), 12), dtype=np.float32)
+    
+    # Extract timestamp-based features (hour of day, day of week, etc.)
+    ts = columns["timestamp"]
+    X[:, 0] = ts.dt.hour.fillna(0).to_numpy()
+    X[:, 1] = ts.dt.weekday.fillna(0).to_numpy()
+    X[:, 2] = ts.dt.day.fillna(0).to_numpy()
+    X[:, 3] = ts.dt.month.fillna(0).to_numpy()
+    
+    # Extract status code features
+    status = columns["status"]
+    X[:, 4] = status
+    X[:, 5] = (status >= 400) & (status < 500)  # Client error
+    X[:, 6] = (status >= 500) & (status < 600)  # Server error
+    
+    # Extract response time features
+    X[:, 7] = columns["response_time"]
+    
+    # Extract text length features
+    text_content = columns["text"]
+    X[:, 8] = text_content.str.len().to_numpy()
+    X[:, 9] = text_content.str.count("ERROR").to_numpy()
+    X[:, 10] = text_content.str.count("WARN").to_numpy()
+    X[:, 11] = text_content.str.count("FATAL").to_numpy()
+    
+    return X
   
-  def _analyze_error_patterns(self, data: List[Dict[str, Any]]) -> Dict[str, Any]:
+  def _analyze_error_patterns(self, columns: Dict[str, Any]) -> Dict[str, Any]:
     """Analyze error patterns in the data."""
-    error_counts = Counter()
-    error_messages = []
-    
-    for entry in data:
-      # Look for error indicators
-      text_content = str(entry.get("message", "")) + str(entry.get("request", ""))
-      
-      if any(keyword in text_content.upper() for keyword in ["ERROR", "EXCEPTION", "FAILED", "FATAL"]):
-        error_counts["error_entries"] += 1
-        error_messages.append(text_content[:200])  # First 200 chars
+    # Look for error indicators
+    text_content = columns["text"]
+    error_mask = text_content.str.contains(ERROR_KEYWORDS_PATTERN, na=False)
+    error_count = int(error_mask.sum())
     
     return {
-      "error_count": error_counts["error_entries"],
-      "error_rate": error_counts["error_entries"] / len(data) if data else 0,
-      "sample_errors": error_messages[:10]
+      "error_count": error_count,
+      "error_rate": error_count / len(text_content) if len(text_content) else 0,
+      "sample_errors": text_content[error_mask].head(10).str.slice(0, 200).tolist()  # First 200 chars
     }
   
-  def _analyze_frequency_patterns(self, data: List[Dict[str, Any]]) -> Dict[str, Any]:
+  def _analyze_frequency_patterns(self, columns: Dict[str, Any]) -> Dict[str, Any]:
     """Analyze frequency patterns."""
-    # Group by time intervals
-    time_groups = defaultdict(int)
+    ts = columns["timestamp"]
     
-    for entry in data:
-      if "timestamp" in entry:
-        try:
-          ts = datetime.fromisoformat(entry["timestamp"].replace("Z", "+00:00"))
-          # Group by 5-minute intervals
-          interval = ts.replace(minute=(ts.minute // 5) * 5, second=0, microsecond=0)
-          time_groups[interval] += 1
-        except:
-          continue
-    
-    if not time_groups:
+    # Group by 5-minute intervals
+    frequencies = ts.dropna().dt.floor("5min").value_counts().to_numpy()
+    
+    if len(frequencies) == 0:
       return {}
     
     # Calculate frequency statistics
-    frequencies = list(time_groups.values())
-    mean_freq = np.mean(frequencies)
-    std_freq = np.std(frequencies)
+    mean_freq = float(frequencies.mean())
+    std_freq = float(frequencies.std())
     
     return {
       "mean_frequency": mean_freq,
       "std_frequency": std_freq,
-      "max_frequency": max(frequencies),
-      "min_frequency": min(frequencies),
+      "max_frequency": int(frequencies.max()),
+      "min_frequency": int(frequencies.min()),
       "frequency_cv": std_freq / mean_freq if mean_freq > 0 else 0
     }
   
@@ -295,27 +486,12 @@ class AnomalyDetectorAgent(BaseAgent):
     llm_manager: LLMManager
   ) -> List[Anomaly]:
     """Use LLM to analyze patterns."""
-    messages = [
-      LLMMessage(
-        role="system",
-        content="""Analyze log patterns and identify anomalies. Look for unusual patterns in error rates, frequency changes, or other indicators of problems."""
-      ),
-      LLMMessage(
-        role="user",
-        content=f"""Analyze these log patterns:
-        
-        Error Patterns: {json.dumps(error_patterns, indent=2)}
-        Frequency Patterns: {json.dumps(frequency_anomalies, indent=2)}
-        
-        Sample log entries: {json.dumps(data[:20], indent=2)}
-        
-        Identify any anomalies and return in JSON format."""
-      )
-    ]
+    messages = self._pattern_messages(data, error_patterns, frequency_anomalies)
     
     try:
-      response = await llm_manager.generate_response(
-        messages=messages,
+      response = await semantic_cached_generate(
+        llm_manager,
+        messages,
         provider_name=self.config["llm_provider"],
         temperature=0.3
       )
@@ -325,6 +501,49 @@ class AnomalyDetectorAgent(BaseAgent):
       print(f"LLM pattern analysis failed: {e}")
       return []
   
+  def _pattern_messages(
+    self,
+    data: List[Dict[str, Any]],
+    error_patterns: Dict[str, Any],
+    frequency_anomalies: Dict[str, Any]
+  ) -> List[LLMMessage]:
+    """Build messages for pattern analysis."""
+    return [
+      PATTERN_SYSTEM_MESSAGE,
+      LLMMessage(
+        role="user",
+        content=f"""Analyze these log patterns:
+        
+        Error Patterns: {_dumps(error_patterns)}
+        Frequency Patterns: {_dumps(frequency_anomalies)}
+        
+        Sample log entries: {_dumps(data[:20])}
+        
+        Identify any anomalies and return in JSON format."""
+      )
+    ]
+  
+  def _extract_templates(self, texts: List[str], max_templates: int = 50) -> List[Dict[str, Any]]:
+    """Mine log templates from text samples, rarest first."""
+    miner = TemplateMiner(config=TemplateMinerConfig())
+    examples = {}
+    
+    for text in texts:
+      result = miner.add_log_message(text)
+      examples.setdefault(result["cluster_id"], text)
+    
+    # Small clusters are the candidate anomalies
+    clusters = sorted(miner.drain.clusters, key=lambda cluster: cluster.size)
+    
+    return [
+      {
+        "template": cluster.get_template(),
+        "count": cluster.size,
+        "example": examples[cluster.cluster_id]
+      }
+      for cluster in clusters[:max_templates]
+    ]
+  
   def _extract_text_samples(self, data: List[Dict[str, Any]]) -> List[str]:
     """Extract text samples for semantic analysis."""
     samples = []
@@ -348,24 +567,29 @@ class AnomalyDetectorAgent(BaseAgent):
     
     try:
       # Try to extract JSON from response
-      json_start = response.find('{')
-      json_end = response.rfind('}') + 1
+      data = _extract_json(response)
       
-      if json_start != -1 and json_end > json_start:
-        json_str = response[json_start:json_end]
-        data = json.loads(json_str)
-        
-        if "anomalies" in data:
-          for anomaly_data in data["anomalies"]:
+      if isinstance(data, dict) and "anomalies" in data:
+        detected_at = datetime.utcnow()
+        for anomaly_data in data["anomalies"]:
+          # LLM output is validated item by item, so one malformed item is
+          # skipped rather than dropping the rest of the response
+          try:
             anomaly = Anomaly(
               severity=anomaly_data.get("severity", "medium"),
               category=anomaly_data.get("category", "llm_detected"),
               description=anomaly_data.get("description", "LLM detected anomaly"),
               confidence=anomaly_data.get("confidence", 0.5),
               data=anomaly_data.get("data", {}),
-              detected_at=datetime.utcnow()
+              detected_at=detected_at
             )
-            anomalies.append(anomaly)
+            if anomaly.severity not in SEVERITIES or not 0.0 <= anomaly.confidence <= 1.0:
+              raise ValueError(f"severity {anomaly.severity!r}, confidence {anomaly.confidence}")
+          except Exception as e:
+            print(f"Skipping invalid LLM anomaly: {e}")
+            continue
+          
+          anomalies.append(anomaly)
     
     except Exception as e:
       print(f"Failed to parse LLM response: {e}")
@@ -379,11 +603,23 @@ class AnomalyDetectorAgent(BaseAgent):
     llm_manager: LLMManager
   ) -> str:
     """Generate analysis summary."""
-    messages = [
-      LLMMessage(
-        role="system",
-        content="Generate a concise summary of log analysis results, highlighting key findings and overall system health."
-      ),
+    messages = self._summary_messages(data, anomalies)
+    
+    try:
+      response = await cached_generate(
+        llm_manager,
+        messages,
+        provider_name=self.config["llm_provider"],
+        temperature=0.3
+      )
+      return response.content
+    except Exception as e:
+      return self._default_summary(data, anomalies)
+  
+  def _summary_messages(self, data: List[Dict[str, Any]], anomalies: List[Anomaly]) -> List[LLMMessage]:
+    """Build messages for the analysis summary."""
+    return [
+      SUMMARY_SYSTEM_MESSAGE,
       LLMMessage(
         role="user",
         content=f"""Analyze {len(data)} log entries and found {len(anomalies)} anomalies.
@@ -394,16 +630,10 @@ class AnomalyDetectorAgent(BaseAgent):
         Generate a professional summary."""
       )
     ]
-    
-    try:
-      response = await llm_manager.generate_response(
-        messages=messages,
-        provider_name=self.config["llm_provider"],
-        temperature=0.3
-      )
-      return response.content
-    except Exception as e:
-      return f"Analysis completed: {len(anomalies)} anomalies detected in {len(data)} log entries."
+  
+  def _default_summary(self, data: List[Dict[str, Any]], anomalies: List[Anomaly]) -> str:
+    """Summary used when the LLM is unavailable."""
+    return f"Analysis completed: {len(anomalies)} anomalies detected in {len(data)} log entries."
   
   async def _generate_recommendations(
     self,
@@ -414,11 +644,23 @@ class AnomalyDetectorAgent(BaseAgent):
     if not anomalies:
       return ["No anomalies detected. System appears healthy."]
     
-    messages = [
-      LLMMessage(
-        role="system",
-        content="Generate actionable recommendations for addressing the detected anomalies."
-      ),
+    messages = self._recommendation_messages(anomalies)
+    
+    try:
+      response = await cached_generate(
+        llm_manager,
+        messages,
+        provider_name=self.config["llm_provider"],
+        temperature=0.3
+      )
+      return self._parse_recommendations(response.content)
+    except Exception as e:
+      return ["Review detected anomalies and take appropriate action."]
+  
+  def _recommendation_messages(self, anomalies: List[Anomaly]) -> List[LLMMessage]:
+    """Build messages for recommendations."""
+    return [
+      RECOMMENDATION_SYSTEM_MESSAGE,
       LLMMessage(
         role="user",
         content=f"""Based on these {len(anomalies)} anomalies, provide specific recommendations:
@@ -428,23 +670,15 @@ class AnomalyDetectorAgent(BaseAgent):
         Provide 3-5 actionable recommendations."""
       )
     ]
-    
-    try:
-      response = await llm_manager.generate_response(
-        messages=messages,
-        provider_name=self.config["llm_provider"],
-        temperature=0.3
-      )
-      
-      # Parse recommendations from response
-      recommendations = []
-      for line in response.content.split('\n'):
-        if line.strip() and (line.strip().startswith('-') or line.strip().startswith('•')):
-          recommendations.append(line.strip()[1:].strip())
-      
-      return recommendations if recommendations else ["Review detected anomalies and take appropriate action."]
-    except Exception as e:
-      return ["Review detected anomalies and take appropriate action."]
+  
+  def _parse_recommendations(self, response: str) -> List[str]:
+    """Parse recommendations from LLM response."""
+    recommendations = []
+    for line in response.split('\n'):
+      if line.strip() and (line.strip().startswith('-') or line.strip().startswith('•')):
+        recommendations.append(line.strip()[1:].strip())
+    
+    return recommendations if recommendations else ["Review detected anomalies and take appropriate action."]
   
   def _get_anomaly_breakdown(self, anomalies: List[Anomaly]) -> str:
     """Get anomaly breakdown by severity."""
@@ -461,9 +695,37 @@ class AnomalyDetectorAgent(BaseAgent):
     
     return breakdown
   
-  def _calculate_metrics(self, data: List[Dict[str, Any]], anomalies: List[Anomaly]) -> Dict[str, Any]:
+  def merge_results(self, results: List[AnalysisResult]) -> AnalysisResult:
+    """Combine the results of analyzing consecutive batches of one data set."""
+    if not results:
+      return AnalysisResult(
+        anomalies=[],
+        summary="No data provided for analysis",
+        recommendations=[],
+        metrics={}
+      )
+    
+    if len(results) == 1:
+      return results[0]
+    
+    anomalies = [anomaly for result in results for anomaly in result.anomalies]
+    total_entries = sum(result.metrics.get("total_entries_analyzed", 0) for result in results)
+    
+    return AnalysisResult(
+      anomalies=anomalies,
+      summary="\n\n".join(result.summary for result in results),
+      recommendations=list(dict.fromkeys(
+        recommendation for result in results for recommendation in result.recommendations
+      )),
+      metrics=self._summarize_metrics(total_entries, anomalies)
+    )
+  
+  def _calculate_metrics(self, columns: Dict[str, Any], anomalies: List[Anomaly]) -> Dict[str, Any]:
     """Calculate analysis metrics."""
-    total_entries = len(data)
+    return self._summarize_metrics(len(columns["text"]), anomalies)
+  
+  def _summarize_metrics(self, total_entries: int, anomalies: List[Anomaly]) -> Dict[str, Any]:
+    """Calculate metrics for anomalies found among total_entries entries."""
     total_anomalies = len(anomalies)
     
     severity_counts = Counter(anomaly.severity for anomaly in anomalies)
@@ -488,17 +750,22 @@ class AnomalyDetectorAgent(BaseAgent):
     }
     return sensitivity_map.get(self.config["sensitivity"], 0.05)
   
-  def _calculate_severity(self, score: float) -> str:
-    """Calculate severity based on anomaly score."""
-    abs_score = abs(score)
-    if abs_score > 0.5:
-      return "critical"
-    elif abs_score > 0.3:
-      return "high"
-    elif abs_score > 0.1:
-      return "medium"
-    else:
-      return "low"
+  def _get_forest_params(self) -> Dict[str, Any]:
+    """Get isolation forest size based on sensitivity."""
+    # Low sensitivity only flags the strongest outliers, which a smaller
+    # forest over a subset of features still isolates reliably
+    if self.config["sensitivity"] == "low":
+      return {"n_estimators": 64, "max_features": 0.8}
+    return {}
+  
+  def _calculate_severity(self, scores: np.ndarray) -> np.ndarray:
+    """Calculate severities based on anomaly scores."""
+    abs_scores = np.abs(scores)
+    return np.select(
+      [abs_scores > 0.5, abs_scores > 0.3, abs_scores > 0.1],
+      ["critical", "high", "medium"],
+      default="low"
+    )
   
   def get_capabilities(self) -> List[str]:
     """Get agent capabilities."""
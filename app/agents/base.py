@@ -16,6 +16,11 @@ class Anomaly(BaseModel):
   detected_at: datetime
 
 
+def _mk_anomaly(**fields: Any) -> Anomaly:
+  """Build an Anomaly from already well-typed fields without validation."""
+  return Anomaly.model_construct(**fields)
+
+
 class AnalysisResult(BaseModel):
   """Analysis result."""
   anomalies: List[Anomaly]
@@ -0,0 +1,34 @@
+"""Celery application shared by the API and the worker."""
+
+import orjson
+from celery import Celery
+from kombu.serialization import register
+from app.config import settings
+
+# orjson for task messages and results; plain json is still accepted
+register(
+  "orjson",
+  orjson.dumps,
+  orjson.loads,
+  content_type="application/x-orjson",
+  content_encoding="binary"
+)
+
+# Create Celery app
+celery_app = Celery(
+  "llm_pipeline",
+  broker=settings.redis_url,
+  backend=settings.redis_url
+)
+
+celery_app.conf.update(
+  task_serializer="orjson",
+  accept_content=["orjson", "json"],
+  result_serializer="orjson",
+  timezone="UTC",
+  enable_utc=True,
+  # Analysis jobs run for minutes, so workers take one task at a time and
+  # acknowledge it once done rather than reserving a queue of them
+  worker_prefetch_multiplier=1,
+  task_acks_late=True,
+)
@@ -3,13 +3,22 @@
 import httpx
 import asyncio
 from datetime import datetime
-from typing import Dict, Any, Iterator, List, Optional
+from typing import Dict, Any, Iterator, List, Optional, Callable, Awaitable
 from app.data_connectors.base import BaseDataConnector
 
 
+MAX_PAGES = 1000
+
+
 class APIConnector(BaseDataConnector):
   """Connector for REST APIs."""
   
+  def __init__(self, config: Dict[str, Any]):
+    """Initialize connector with configuration."""
+    super().__init__(config)
+    # The sync HTTP client is created on first use and reused across requests
+    self._sync_client: Optional[httpx.Client] = None
+  
   def validate_config(self) -> None:
     """Validate API connector configuration."""
     required_fields = ["base_url", "endpoint"]
@@ -21,10 +30,44 @@ class APIConnector(BaseDataConnector):
     """Test API connectivity."""
     return self.test_connection()
   
+  def _new_async_client(self) -> httpx.AsyncClient:
+    """Create an async HTTP client for one fetch."""
+    return httpx.AsyncClient(
+      http2=True,
+      timeout=30,
+      limits=httpx.Limits(max_keepalive_connections=32, max_connections=32)
+    )
+  
+  def _get_sync_client(self) -> httpx.Client:
+    """Get the shared sync HTTP client."""
+    if self._sync_client is None:
+      self._sync_client = httpx.Client(
+        http2=True,
+        timeout=30,
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=32)
+      )
+    return self._sync_client
+  
+  def close(self) -> None:
+    """Close the sync HTTP client."""
+    if self._sync_client is not None:
+      self._sync_client.close()
+      self._sync_client = None
+  
+  async def aclose(self) -> None:
+    """Close the HTTP client, for use with ``async with``."""
+    self.close()
+  
+  async def __aenter__(self) -> "APIConnector":
+    return self
+  
+  async def __aexit__(self, *exc_info) -> None:
+    await self.aclose()
+  
   def test_connection(self) -> bool:
     """Test API connection."""
     try:
-      response = httpx.get(
+      response = self._get_sync_client().get(
         f"{self.config['base_url']}{self.config['endpoint']}",
         headers=self.config.get("headers", {}),
         timeout=10
@@ -64,7 +107,7 @@ class APIConnector(BaseDataConnector):
         params["per_page"] = self.config.get("page_size", 100)
       
       try:
-        response = httpx.get(
+        response = self._get_sync_client().get(
           f"{base_url}{endpoint}",
           headers=headers,
           params=params,
@@ -75,12 +118,7 @@ class APIConnector(BaseDataConnector):
         data = response.json()
         
         # Handle different response formats
-        if isinstance(data, list):
-          items = data
-        elif isinstance(data, dict):
-          items = data.get("data", data.get("results", [data]))
-        else:
-          items = [data]
+        items = self._extract_items(data)
         
         if not items:
           break
@@ -92,16 +130,13 @@ class APIConnector(BaseDataConnector):
           break
         
         # Check for pagination indicators
-        if isinstance(data, dict):
-          if "next" not in data or not data["next"]:
-            break
-          if "has_next" in data and not data["has_next"]:
-            break
+        if not self._has_next_page(data):
+          break
         
         page += 1
         
         # Safety limit
-        if page > 1000:
+        if page > MAX_PAGES:
           break
       
       except Exception as e:
@@ -112,65 +147,134 @@ class APIConnector(BaseDataConnector):
   
   async def fetch_data_async(self, start_time: datetime, end_time: datetime) -> List[Dict[str, Any]]:
     """Async version of data fetching."""
-    async with httpx.AsyncClient() as client:
-      base_url = self.config["base_url"]
-      endpoint = self.config["endpoint"]
-      headers = self.config.get("headers", {})
-      params = self.config.get("params", {})
-      
-      if self.config.get("supports_time_filter", False):
-        params.update({
-          "start_time": start_time.isoformat(),
-          "end_time": end_time.isoformat()
-        })
-      
-      all_data = []
-      page = 1
+    # A client per fetch: its connections are bound to the running event loop,
+    # and callers such as the worker start a new loop for each batch
+    async with self._new_async_client() as client:
+      return await self._fetch_all_data_async(client, start_time, end_time)
+  
+  async def _fetch_all_data_async(
+    self,
+    client: httpx.AsyncClient,
+    start_time: datetime,
+    end_time: datetime
+  ) -> List[Dict[str, Any]]:
+    """Fetch all data from API with the given client."""
+    url = f"{self.config['base_url']}{self.config['endpoint']}"
+    headers = self.config.get("headers", {})
+    params = dict(self.config.get("params", {}))
+    supports_pagination = self.config.get("supports_pagination", False)
+    page_size = self.config.get("page_size", 100)
+    
+    if self.config.get("supports_time_filter", False):
+      params.update({
+        "start_time": start_time.isoformat(),
+        "end_time": end_time.isoformat()
+      })
+    
+    async def fetch_page(page: int) -> Any:
+      page_params = dict(params)
+      if supports_pagination:
+        page_params["page"] = page
+        page_params["per_page"] = page_size
       
-      while True:
-        if self.config.get("supports_pagination", False):
-          params["page"] = page
-          params["per_page"] = self.config.get("page_size", 100)
+      response = await client.get(url, headers=headers, params=page_params, timeout=30)
+      response.raise_for_status()
+      return response.json()
+    
+    all_data = []
+    page = 1
+    
+    while True:
+      try:
+        data = await fetch_page(page)
+        items = self._extract_items(data)
+        
+        if not items:
+          break
+        
+        all_data.extend(items)
+        
+        if not supports_pagination:
+          break
         
-        try:
-          response = await client.get(
-            f"{base_url}{endpoint}",
-            headers=headers,
-            params=params,
-            timeout=30
-          )
-          response.raise_for_status()
-          
-          data = response.json()
-          
-          if isinstance(data, list):
-            items = data
-          elif isinstance(data, dict):
-            items = data.get("data", data.get("results", [data]))
-          else:
-            items = [data]
-          
-          if not items:
-            break
-          
-          all_data.extend(items)
-          
-          if not self.config.get("supports_pagination", False):
-            break
-          
-          if isinstance(data, dict):
-            if "next" not in data or not data["next"]:
-              break
-            if "has_next" in data and not data["has_next"]:
-              break
-          
-          page += 1
-          
-          if page > 1000:
-            break
+        # When the response reports the total, fetch the remaining pages concurrently
+        last_page = self._get_last_page(data, page_size)
+        if last_page is not None:
+          all_data.extend(await self._fetch_pages_concurrently(fetch_page, page + 1, last_page))
+          break
         
-        except Exception as e:
-          print(f"Async API request failed: {e}")
+        if not self._has_next_page(data):
           break
+        
+        page += 1
+        
+        if page > MAX_PAGES:
+          break
+      
+      except Exception as e:
+        print(f"Async API request failed: {e}")
+        break
+    
+    return all_data
+  
+  async def _fetch_pages_concurrently(
+    self,
+    fetch_page: Callable[[int], Awaitable[Any]],
+    first_page: int,
+    last_page: int
+  ) -> List[Dict[str, Any]]:
+    """Fetch a range of pages concurrently, keeping page order."""
+    semaphore = asyncio.Semaphore(self.config.get("max_concurrency", 8))
+    
+    async def fetch_bounded(page: int) -> Any:
+      async with semaphore:
+        return await fetch_page(page)
+    
+    pages = range(first_page, min(last_page, MAX_PAGES) + 1)
+    results = await asyncio.gather(*(fetch_bounded(page) for page in pages), return_exceptions=True)
+    
+    # Stop at the first failed or empty page, as the sequential loop would
+    all_data = []
+    for result in results:
+      if isinstance(result, Exception):
+        print(f"Async API request failed: {result}")
+        break
       
-      return all_data
+      items = self._extract_items(result)
+      if not items:
+        break
+      all_data.extend(items)
+    
+    return all_data
+  
+  def _extract_items(self, data: Any) -> List[Dict[str, Any]]:
+    """Extract items from the different response formats."""
+    if isinstance(data, list):
+      return data
+    elif isinstance(data, dict):
+      return data.get("data", data.get("results", [data]))
+    else:
+      return [data]
+  
+  def _has_next_page(self, data: Any) -> bool:
+    """Check pagination indicators for more pages."""
+    if isinstance(data, dict):
+      if "next" not in data or not data["next"]:
+        return False
+      if "has_next" in data and not data["has_next"]:
+        return False
+    return True
+  
+  def _get_last_page(self, data: Any, page_size: int) -> Optional[int]:
+    """Get the last page number when the response reports a total."""
+    if not isinstance(data, dict):
+      return None
+    
+    if isinstance(data.get("total_pages"), int):
+      return data["total_pages"]
+    
+    for key in ("total", "count"):
+      if isinstance(data.get(key), int) and page_size > 0:
+        return -(-data[key] // page_size)
+    
+    return None
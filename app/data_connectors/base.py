@@ -33,6 +33,10 @@ class BaseDataConnector(ABC):
     """Test if connection is working."""
     pass
   
+  def close(self) -> None:
+    """Release resources held by the connector."""
+    pass
+  
   def get_metadata(self) -> Dict[str, Any]:
     """Get connector metadata."""
     return {
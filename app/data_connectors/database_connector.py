@@ -1,11 +1,26 @@
 """Database data connector."""
 
+import re
 import pandas as pd
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, text, bindparam, DateTime
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import make_url
+from sqlalchemy.sql.elements import TextClause
 from datetime import datetime
 from typing import Dict, Any, Iterator, List
 from app.data_connectors.base import BaseDataConnector
 
+try:
+  import adbc_driver_postgresql.dbapi as adbc_postgresql
+except ImportError:
+  adbc_postgresql = None
+
+
+# Legacy '{start_time}' / '{end_time}' string literals, rewritten to bind parameters
+QUOTED_TIME_PLACEHOLDER_PATTERN = re.compile(r"'\{(start_time|end_time)\}'")
+# Any other {start_time} / {end_time}, e.g. inside a longer literal, is filled in as text
+TIME_PLACEHOLDER_PATTERN = re.compile(r"\{(start_time|end_time)\}")
+
 
 class DatabaseConnector(BaseDataConnector):
   """Connector for database queries."""
@@ -17,11 +32,19 @@ class DatabaseConnector(BaseDataConnector):
       if field not in self.config:
         raise ValueError(f"Missing required field: {field}")
   
+  def _ensure_engine(self) -> None:
+    """Create the engine on first use and reuse it afterwards."""
+    if getattr(self, "engine", None) is None:
+      self.engine = create_engine(
+        self.config["connection_string"],
+        pool_pre_ping=True,
+        pool_size=self.config.get("pool_size", 5)
+      )
+  
   def connect(self) -> bool:
     """Establish database connection."""
+    self._ensure_engine()
     try:
-      self.engine = create_engine(self.config["connection_string"])
-      # Test connection
       with self.engine.connect() as conn:
         conn.execute(text("SELECT 1"))
       return True
@@ -32,37 +55,73 @@ class DatabaseConnector(BaseDataConnector):
     """Test database connection."""
     return self.connect()
   
+  def close(self) -> None:
+    """Dispose of the engine's connection pool."""
+    if getattr(self, "engine", None) is not None:
+      self.engine.dispose()
+      self.engine = None
+  
+  def _build_query(self, start_time: datetime, end_time: datetime) -> TextClause:
+    """Get the configured query with the time range as bound parameters."""
+    params = {"start_time": start_time, "end_time": end_time}
+    
+    # Parenthesized so a following ::timestamp cast isn't read as part of the name
+    query = QUOTED_TIME_PLACEHOLDER_PATTERN.sub(r"(:\1)", self.config["query"])
+    query = TIME_PLACEHOLDER_PATTERN.sub(
+      lambda match: params[match.group(1)].strftime("%Y-%m-%d %H:%M:%S"),
+      query
+    )
+    
+    # Only bind the placeholders the query actually uses
+    clause = text(query)
+    used = clause.compile().params
+    return clause.bindparams(*[
+      bindparam(name, value, type_=DateTime)
+      for name, value in params.items() if name in used
+    ])
+  
   def fetch_data(self, start_time: datetime, end_time: datetime) -> Iterator[Dict[str, Any]]:
     """Fetch data using configured query."""
-    query = self.config["query"]
-    
-    # Replace time placeholders if they exist
-    if "{start_time}" in query:
-      query = query.replace("{start_time}", start_time.strftime("%Y-%m-%d %H:%M:%S"))
-    if "{end_time}" in query:
-      query = query.replace("{end_time}", end_time.strftime("%Y-%m-%d %H:%M:%S"))
+    self._ensure_engine()
+    query = self._build_query(start_time, end_time)
+    chunk_size = self.config.get("chunk_size", 10_000)
     
     try:
+      # Stream the result with a server-side cursor, chunk_size rows at a time;
+      # rows keep the driver's types, unlike a round trip through pandas
       with self.engine.connect() as conn:
-        result = conn.execute(text(query))
-        
+        result = conn.execution_options(stream_results=True, yield_per=chunk_size).execute(query)
         for row in result:
-          # Convert row to dictionary
-          row_dict = dict(row._mapping)
-          yield row_dict
+          yield dict(row._mapping)
+    
+    except Exception as e:
+      raise Exception(f"Database query failed: {str(e)}")
+  
+  def fetch_arrow(self, start_time: datetime, end_time: datetime) -> "pyarrow.Table":
+    """Fetch data as an Arrow table using the ADBC PostgreSQL driver."""
+    if adbc_postgresql is None:
+      raise ImportError("fetch_arrow requires the adbc-driver-postgresql package")
+    
+    # ADBC takes plain SQL, so render the bound time range as PostgreSQL literals
+    query = str(self._build_query(start_time, end_time).compile(
+      dialect=postgresql.dialect(),
+      compile_kwargs={"literal_binds": True}
+    ))
+    # libpq expects a plain postgresql:// URI without the SQLAlchemy driver suffix
+    uri = make_url(self.config["connection_string"]).set(drivername="postgresql")
     
+    try:
+      with adbc_postgresql.connect(uri.render_as_string(hide_password=False)) as conn:
+        with conn.cursor() as cursor:
+          cursor.execute(query)
+          return cursor.fetch_arrow_table()
     except Exception as e:
       raise Exception(f"Database query failed: {str(e)}")
   
   def fetch_dataframe(self, start_time: datetime, end_time: datetime) -> pd.DataFrame:
     """Fetch data as pandas DataFrame."""
-    query = self.config["query"]
-    
-    # Replace time placeholders
-    if "{start_time}" in query:
-      query = query.replace("{start_time}", start_time.strftime("%Y-%m-%d %H:%M:%S"))
-    if "{end_time}" in query:
-      query = query.replace("{end_time}", end_time.strftime("%Y-%m-%d %H:%M:%S"))
+    self._ensure_engine()
+    query = self._build_query(start_time, end_time)
     
     try:
       return pd.read_sql(query, self.engine)
@@ -71,16 +130,17 @@ class DatabaseConnector(BaseDataConnector):
   
   def get_table_schema(self, table_name: str) -> List[Dict[str, Any]]:
     """Get table schema information."""
-    query = f"""
+    query = text("""
     SELECT column_name, data_type, is_nullable, column_default
     FROM information_schema.columns
-    WHERE table_name = '{table_name}'
+    WHERE table_name = :table_name
     ORDER BY ordinal_position
-    """
+    """).bindparams(table_name=table_name)
     
+    self._ensure_engine()
     try:
       with self.engine.connect() as conn:
-        result = conn.execute(text(query))
+        result = conn.execute(query)
         return [dict(row._mapping) for row in result]
     except Exception as e:
       raise Exception(f"Failed to get table schema: {str(e)}")
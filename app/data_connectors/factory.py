@@ -1,28 +1,39 @@
 """Data connector factory."""
 
-from typing import Dict, Any, Type
+import importlib
+from typing import Dict, Any, Type, Callable
 from app.data_connectors.base import BaseDataConnector
-from app.data_connectors.log_connector import LogConnector
-from app.data_connectors.database_connector import DatabaseConnector
-from app.data_connectors.api_connector import APIConnector
+
+
+def _imp(module_name: str, class_name: str) -> Type[BaseDataConnector]:
+  """Import a connector class by module and class name."""
+  return getattr(importlib.import_module(module_name), class_name)
 
 
 class DataConnectorFactory:
   """Factory for creating data connectors."""
   
-  _connectors: Dict[str, Type[BaseDataConnector]] = {
-    "log": LogConnector,
-    "database": DatabaseConnector,
-    "api": APIConnector
+  # Connector modules pull in pandas, sqlalchemy or httpx, so they are only
+  # imported when a connector of that type is first created
+  _connectors: Dict[str, Callable[[], Type[BaseDataConnector]]] = {
+    "log": lambda: _imp("app.data_connectors.log_connector", "LogConnector"),
+    "database": lambda: _imp("app.data_connectors.database_connector", "DatabaseConnector"),
+    "api": lambda: _imp("app.data_connectors.api_connector", "APIConnector")
   }
   
+  _resolved: Dict[str, Type[BaseDataConnector]] = {}
+  
   @classmethod
   def create_connector(cls, connector_type: str, config: Dict[str, Any]) -> BaseDataConnector:
     """Create a data connector instance."""
+    # Only the class lookup is memoized: instances hold engines and open
+    # streams that callers close when done, so they are never shared
     if connector_type not in cls._connectors:
       raise ValueError(f"Unknown connector type: {connector_type}")
     
-    connector_class = cls._connectors[connector_type]
+    connector_class = cls._resolved.get(connector_type)
+    if connector_class is None:
+      connector_class = cls._resolved[connector_type] = cls._connectors[connector_type]()
     return connector_class(config)
   
   @classmethod
@@ -33,4 +44,5 @@ class DataConnectorFactory:
   @classmethod
   def register_connector(cls, connector_type: str, connector_class: Type[BaseDataConnector]) -> None:
     """Register a new connector type."""
-    cls._connectors[connector_type] = connector_class
+    cls._connectors[connector_type] = lambda: connector_class
+    cls._resolved[connector_type] = connector_class
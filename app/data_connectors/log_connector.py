@@ -3,10 +3,283 @@
 import os
 import re
 import json
-from datetime import datetime
-from typing import Dict, Any, Iterator, List
+import mmap
+import multiprocessing
+import numpy as np
+import orjson
+from collections import deque
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Iterator, Iterable, List, Callable, Tuple, Optional
 from app.data_connectors.base import BaseDataConnector
 
+try:
+  import re2
+except ImportError:
+  re2 = None
+
+try:
+  import numba
+except ImportError:
+  numba = None
+
+
+def _compile_pattern(pattern: str) -> "re.Pattern":
+  """Compile a line pattern with RE2 when available, falling back to re."""
+  if re2 is not None:
+    try:
+      return re2.compile(pattern)
+    except Exception:
+      # RE2 rejects backreferences and lookarounds
+      pass
+  return re.compile(pattern)
+
+
+APACHE_COMMON_PATTERN = _compile_pattern(r'(\S+) (\S+) (\S+) \[([^\]]+)\] "([^"]*)" (\d+) (\S+)')
+
+# ASCII characters str.strip() removes, for stripping bytes the same way
+ASCII_WHITESPACE = b" \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f"
+
+SUPPORTED_LOG_FORMATS = ["json", "apache_common", "nginx", "custom"]
+
+TIMESTAMP_FORMATS = ["%d/%b/%Y:%H:%M:%S %z", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S"]
+
+_MONTHS = {
+  name: number
+  for number, name in enumerate(["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"], 1)
+}
+
+
+@lru_cache(maxsize=64)
+def _utc_offset(offset: str) -> timezone:
+  """Get the timezone for a '+HHMM' / '-HHMM' offset."""
+  delta = timedelta(hours=int(offset[1:3]), minutes=int(offset[3:5]))
+  return timezone(-delta if offset[0] == "-" else delta)
+
+
+def _parse_apache_timestamp(ts: str) -> datetime:
+  """Parse a '01/Jan/2024:10:00:00 +0000' timestamp by slicing its fixed fields."""
+  return datetime(
+    int(ts[7:11]), _MONTHS[ts[3:6]], int(ts[0:2]),
+    int(ts[12:14]), int(ts[15:17]), int(ts[18:20]),
+    tzinfo=_utc_offset(ts[21:26])
+  )
+
+
+def _parse_iso_timestamp(ts: str) -> datetime:
+  """Parse a '2024-01-01 10:00:00' or '2024-01-01T10:00:00' timestamp by slicing its fixed fields."""
+  return datetime(
+    int(ts[0:4]), int(ts[5:7]), int(ts[8:10]),
+    int(ts[11:13]), int(ts[14:16]), int(ts[17:19])
+  )
+
+
+def _make_timestamp_parser(fmt: str) -> Callable[[str], datetime]:
+  """Build a parser for one of TIMESTAMP_FORMATS that raises ValueError on mismatch."""
+  if fmt == "%d/%b/%Y:%H:%M:%S %z":
+    is_fixed_width = lambda ts: len(ts) == 26 and ts[2] == "/" and ts[6] == "/" and ts[11] == ":" and ts[20] == " " and ts[21] in "+-"
+    parse_fixed_width = _parse_apache_timestamp
+  else:
+    separator = fmt[8]
+    is_fixed_width = lambda ts: len(ts) == 19 and ts[4] == "-" and ts[7] == "-" and ts[10] == separator and ts[13] == ":" and ts[16] == ":"
+    parse_fixed_width = _parse_iso_timestamp
+  
+  def parse(ts: str) -> datetime:
+    if is_fixed_width(ts):
+      try:
+        return parse_fixed_width(ts)
+      except (ValueError, KeyError):
+        pass
+    
+    # Irregular widths or month names go through strptime
+    return datetime.strptime(ts, fmt)
+  
+  return parse
+
+
+TIMESTAMP_PARSERS = [_make_timestamp_parser(fmt) for fmt in TIMESTAMP_FORMATS]
+
+
+# Columns of the Apache scan output: line start/end, match flag, start/end of the 7 groups,
+# then the timestamp as UTC epoch seconds (NO_EPOCH when it isn't a regular fixed-width value)
+APACHE_SCAN_COLUMNS = 18
+NO_EPOCH = np.iinfo(np.int64).min
+
+_MONTH_KEYS = np.array([
+  (ord(name[0]) << 16) | (ord(name[1]) << 8) | ord(name[2])
+  for name in _MONTHS
+], dtype=np.int64)
+
+
+def _is_space(byte: int) -> bool:
+  """Check for ASCII whitespace as matched by \\s."""
+  return byte == 32 or 9 <= byte <= 13 or 28 <= byte <= 31
+
+
+def _scan_field(buf: np.ndarray, pos: int, stop: int) -> int:
+  """Return the end of the run of non-whitespace bytes starting at pos."""
+  while pos < stop and not _is_space(buf[pos]):
+    pos += 1
+  return pos
+
+
+def _match_apache_line(buf: np.ndarray, pos: int, stop: int, row: np.ndarray) -> int:
+  """Match one line against APACHE_COMMON_PATTERN, writing group offsets to row[3:17]."""
+  # ip, identity and user: (\S+) followed by a space
+  for col in range(3, 9, 2):
+    end = _scan_field(buf, pos, stop)
+    if end == pos or end >= stop or buf[end] != 32:
+      return 0
+    row[col] = pos
+    row[col + 1] = end
+    pos = end + 1
+  
+  # \[([^\]]+)\] "
+  if pos >= stop or buf[pos] != 91:
+    return 0
+  pos += 1
+  end = pos
+  while end < stop and buf[end] != 93:
+    end += 1
+  if end == pos or end + 2 >= stop or buf[end + 1] != 32 or buf[end + 2] != 34:
+    return 0
+  row[9] = pos
+  row[10] = end
+  pos = end + 3
+  
+  # ([^"]*)" followed by a space
+  end = pos
+  while end < stop and buf[end] != 34:
+    end += 1
+  if end + 1 >= stop or buf[end + 1] != 32:
+    return 0
+  row[11] = pos
+  row[12] = end
+  pos = end + 2
+  
+  # (\d+) followed by a space
+  end = pos
+  while end < stop and 48 <= buf[end] <= 57:
+    end += 1
+  if end == pos or end >= stop or buf[end] != 32:
+    return 0
+  row[13] = pos
+  row[14] = end
+  pos = end + 1
+  
+  # (\S+)
+  end = _scan_field(buf, pos, stop)
+  if end == pos:
+    return 0
+  row[15] = pos
+  row[16] = end
+  return 1
+
+
+def _read_digits(buf: np.ndarray, pos: int, count: int) -> int:
+  """Read count ASCII digits at pos as an integer, or -1 if any byte isn't a digit."""
+  value = 0
+  for i in range(pos, pos + count):
+    digit = buf[i] - 48
+    if digit < 0 or digit > 9:
+      return -1
+    value = value * 10 + digit
+  return value
+
+
+def _apache_epoch(buf: np.ndarray, pos: int, end: int) -> int:
+  """Convert a '01/Jan/2024:10:00:00 +0000' timestamp to UTC epoch seconds, or NO_EPOCH."""
+  if end - pos != 26 or buf[pos + 2] != 47 or buf[pos + 6] != 47 or buf[pos + 11] != 58:
+    return NO_EPOCH
+  if buf[pos + 14] != 58 or buf[pos + 17] != 58 or buf[pos + 20] != 32:
+    return NO_EPOCH
+  
+  key = (np.int64(buf[pos + 3]) << 16) | (np.int64(buf[pos + 4]) << 8) | np.int64(buf[pos + 5])
+  month = 0
+  for i in range(12):
+    if _MONTH_KEYS[i] == key:
+      month = i + 1
+  
+  day = _read_digits(buf, pos, 2)
+  year = _read_digits(buf, pos + 7, 4)
+  hour = _read_digits(buf, pos + 12, 2)
+  minute = _read_digits(buf, pos + 15, 2)
+  second = _read_digits(buf, pos + 18, 2)
+  offset_hours = _read_digits(buf, pos + 22, 2)
+  offset_minutes = _read_digits(buf, pos + 24, 2)
+  sign = buf[pos + 21]
+  if month == 0 or year < 1 or hour < 0 or hour > 23 or minute < 0 or minute > 59 or second < 0 or second > 59:
+    return NO_EPOCH
+  if offset_hours < 0 or offset_hours > 23 or offset_minutes < 0 or offset_minutes > 59 or (sign != 43 and sign != 45):
+    return NO_EPOCH
+  
+  leap = year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+  month_days = 29 if month == 2 and leap else (28 if month == 2 else (30 if month in (4, 6, 9, 11) else 31))
+  if day < 1 or day > month_days:
+    return NO_EPOCH
+  
+  # Days since 1970-01-01 from the civil date
+  y = year - 1 if month <= 2 else year
+  era = y // 400
+  year_of_era = y - era * 400
+  day_of_year = (153 * (month - 3 if month > 2 else month + 9) + 2) // 5 + day - 1
+  day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+  days = era * 146097 + day_of_era - 719468
+  
+  offset = offset_hours * 3600 + offset_minutes * 60
+  if sign == 45:
+    offset = -offset
+  return days * 86400 + hour * 3600 + minute * 60 + second - offset
+
+
+def _scan_apache_lines(buf: np.ndarray, out: np.ndarray) -> int:
+  """Split a buffer into lines and match each against the Apache Common format.
+  
+  Writes one row of APACHE_SCAN_COLUMNS offsets per line and returns the line count.
+  """
+  size = buf.shape[0]
+  line = 0
+  pos = 0
+  while pos < size:
+    end = pos
+    while end < size and buf[end] != 10:
+      end += 1
+    
+    # Drop the newline, including the \r of CRLF line endings
+    stop = end - 1 if end > pos and buf[end - 1] == 13 else end
+    out[line, 0] = pos
+    out[line, 1] = stop
+    out[line, 2] = _match_apache_line(buf, pos, stop, out[line])
+    out[line, 17] = _apache_epoch(buf, out[line, 9], out[line, 10]) if out[line, 2] else NO_EPOCH
+    line += 1
+    pos = end + 1
+  
+  return line
+
+
+if numba is not None:
+  _is_space = numba.njit(cache=True)(_is_space)
+  _scan_field = numba.njit(cache=True, boundscheck=False)(_scan_field)
+  _match_apache_line = numba.njit(cache=True, boundscheck=False)(_match_apache_line)
+  _read_digits = numba.njit(cache=True, boundscheck=False)(_read_digits)
+  _apache_epoch = numba.njit(cache=True, boundscheck=False)(_apache_epoch)
+  _scan_apache_lines = numba.njit(cache=True, boundscheck=False)(_scan_apache_lines)
+
+
+def _parse_range(
+  config: Dict[str, Any],
+  start: int,
+  end: int,
+  start_time: datetime,
+  end_time: datetime
+) -> Tuple[List[Dict[str, Any]], int]:
+  """Parse one newline-aligned byte range of a log file in a worker process.
+  
+  Returns the entries, numbered from the start of the range, and the number of lines read.
+  """
+  return LogConnector(config)._parse_chunk(start, end, start_time, end_time)
+
 
 class LogConnector(BaseDataConnector):
   """Connector for log files."""
@@ -20,6 +293,31 @@ class LogConnector(BaseDataConnector):
     
     if not os.path.exists(self.config["file_path"]):
       raise FileNotFoundError(f"Log file not found: {self.config['file_path']}")
+    
+    if self.config["log_format"] not in SUPPORTED_LOG_FORMATS:
+      raise ValueError(f"Unsupported log format: {self.config['log_format']}")
+    
+    # Timestamp parser that matched the last entry; a file normally uses one format throughout
+    self._ts_parser: Optional[Callable[[str], datetime]] = None
+    
+    # Compile the custom pattern once instead of on every parsed line
+    self._custom_pattern = None
+    if self.config["log_format"] == "custom":
+      if "regex_pattern" not in self.config:
+        raise ValueError("Custom format requires regex_pattern in config")
+      self._custom_pattern = _compile_pattern(self.config["regex_pattern"])
+    
+    # Cheap substring checks for lines that cannot parse in each format
+    self._prefilter: Dict[str, Callable[[str], bool]] = {
+      "json": lambda line: line.lstrip()[:1] == "{",
+      "apache_common": lambda line: '] "' in line,
+      "nginx": lambda line: '"' in line
+    }
+    
+    # Parsers taking ASCII lines as bytes, so they need no decoding
+    self._bytes_parsers: Dict[str, Callable[[bytes], Optional[Dict[str, Any]]]] = {
+      "json": self._parse_json_bytes
+    }
   
   def connect(self) -> bool:
     """Test file accessibility."""
@@ -31,24 +329,224 @@ class LogConnector(BaseDataConnector):
   
   def fetch_data(self, start_time: datetime, end_time: datetime) -> Iterator[Dict[str, Any]]:
     """Fetch log entries within time range."""
+    workers = self.config.get("workers", 1)
+    size = os.path.getsize(self.config["file_path"])
+    
+    # Large files are split into byte ranges parsed by a process pool
+    if workers > 1 and size >= self.config.get("parallel_min_bytes", 64 * 1024 * 1024):
+      yield from self._fetch_parallel(start_time, end_time, workers)
+    elif self._use_numba():
+      yield from self._fetch_chunks(start_time, end_time)
+    else:
+      yield from self._parse_lines(self._iter_lines(), start_time, end_time)
+  
+  def _use_numba(self) -> bool:
+    """Check whether lines are matched by the compiled Apache scanner."""
+    return numba is not None and self.config["log_format"] == "apache_common" and self.config.get("use_numba", True)
+  
+  def _fetch_chunks(self, start_time: datetime, end_time: datetime) -> Iterator[Dict[str, Any]]:
+    """Fetch log entries parsing the file one chunk at a time."""
+    boundaries = self._chunk_boundaries(self.config.get("parallel_chunk_bytes", 32 * 1024 * 1024))
+    line_offset = 0
+    
+    for start, end in zip(boundaries, boundaries[1:]):
+      entries, line_count = self._parse_chunk(start, end, start_time, end_time)
+      yield from self._offset_line_numbers(entries, line_offset)
+      line_offset += line_count
+  
+  def _parse_chunk(
+    self,
+    start: int,
+    end: int,
+    start_time: datetime,
+    end_time: datetime
+  ) -> Tuple[List[Dict[str, Any]], int]:
+    """Parse a byte range of the file, returning its entries and line count."""
+    if self._use_numba():
+      with open(self.config["file_path"], "rb") as file:
+        file.seek(start)
+        return self._parse_apache_buffer(file.read(end - start), start_time, end_time)
+    
+    lines = list(self._iter_lines(start, end))
+    return list(self._parse_lines(lines, start_time, end_time)), len(lines)
+  
+  def _parse_apache_buffer(
+    self,
+    buf: bytes,
+    start_time: datetime,
+    end_time: datetime
+  ) -> Tuple[List[Dict[str, Any]], int]:
+    """Parse Apache Common lines from a buffer with the compiled scanner."""
+    offsets = np.empty((buf.count(b"\n") + 1, APACHE_SCAN_COLUMNS), dtype=np.int64)
+    line_count = _scan_apache_lines(np.frombuffer(buf, dtype=np.uint8), offsets)
+    
+    offsets = offsets[:line_count]
+    keep = offsets[:, 2] == 1
+    
+    # Filter regular timestamps on their epoch seconds; irregular ones are checked per entry
+    epochs = offsets[:, 17]
+    has_epoch = epochs != NO_EPOCH
+    start_aware = start_time.utcoffset() is not None
+    end_aware = end_time.utcoffset() is not None
+    if start_aware and end_aware:
+      in_range = (epochs >= start_time.timestamp()) & (epochs <= end_time.timestamp())
+      keep &= in_range | ~has_epoch
+    elif start_aware or end_aware:
+      # Mixed aware/naive bounds are left to the per-entry comparison
+      has_epoch[:] = False
+    
+    # A chunk that decodes as a whole needs no per-line UTF-8 check
+    include_raw = self.config.get("include_raw", False)
+    try:
+      buf.decode("utf-8")
+      check_lines = include_raw
+    except UnicodeDecodeError:
+      check_lines = True
+    
+    # Only matched lines within the time range are materialized as dicts
+    kept = np.flatnonzero(keep)
+    entries = []
+    for index, row, checked in zip(kept.tolist(), offsets[kept].tolist(), has_epoch[kept].tolist()):
+      if check_lines:
+        line = self._decode_line(buf[row[0]:row[1]])
+        if line is None:
+          continue
+      
+      timestamp = buf[row[9]:row[10]].decode("utf-8")
+      if not checked and not self._timestamp_in_range(timestamp, start_time, end_time):
+        continue
+      
+      entry = {
+        "ip": buf[row[3]:row[4]].decode("utf-8"),
+        "identity": buf[row[5]:row[6]].decode("utf-8"),
+        "user": buf[row[7]:row[8]].decode("utf-8"),
+        "timestamp": timestamp,
+        "request": buf[row[11]:row[12]].decode("utf-8"),
+        "status": int(buf[row[13]:row[14]]),
+        "size": buf[row[15]:row[16]].decode("utf-8")
+      }
+      if include_raw:
+        entry["line_number"] = index + 1
+        entry["raw_line"] = line.strip()
+      entries.append(entry)
+    
+    return entries, line_count
+  
+  def _fetch_parallel(self, start_time: datetime, end_time: datetime, workers: int) -> Iterator[Dict[str, Any]]:
+    """Fetch log entries parsing chunks of the file in worker processes."""
+    boundaries = self._chunk_boundaries(self.config.get("parallel_chunk_bytes", 32 * 1024 * 1024))
+    ranges = iter(zip(boundaries, boundaries[1:]))
+    line_offset = 0
+    
+    # Spawned rather than forked: callers such as the worker's batch
+    # prefetcher run this from a thread, and a fork could inherit held locks
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+      # Keep a bounded window of chunks in flight and yield them in file order
+      pending = deque()
+      for _ in range(workers * 2):
+        next_range = next(ranges, None)
+        if next_range is None:
+          break
+        pending.append(executor.submit(_parse_range, self.config, *next_range, start_time, end_time))
+      
+      while pending:
+        entries, line_count = pending.popleft().result()
+        
+        next_range = next(ranges, None)
+        if next_range is not None:
+          pending.append(executor.submit(_parse_range, self.config, *next_range, start_time, end_time))
+        
+        yield from self._offset_line_numbers(entries, line_offset)
+        line_offset += line_count
+  
+  def _offset_line_numbers(self, entries: List[Dict[str, Any]], line_offset: int) -> List[Dict[str, Any]]:
+    """Shift chunk-relative line numbers by the lines of the preceding chunks."""
+    if line_offset and self.config.get("include_raw", False):
+      for entry in entries:
+        entry["line_number"] += line_offset
+    return entries
+  
+  def _chunk_boundaries(self, chunk_bytes: int) -> List[int]:
+    """Split the file into byte ranges that start at line boundaries."""
+    with open(self.config["file_path"], "rb") as file:
+      size = os.fstat(file.fileno()).st_size
+      boundaries = [0]
+      if size == 0:
+        return boundaries
+      
+      with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        while boundaries[-1] + chunk_bytes < size:
+          newline = mm.find(b"\n", boundaries[-1] + chunk_bytes)
+          if newline == -1 or newline + 1 >= size:
+            break
+          boundaries.append(newline + 1)
+    
+    boundaries.append(size)
+    return boundaries
+  
+  def _parse_lines(
+    self,
+    lines: Iterable[bytes],
+    start_time: datetime,
+    end_time: datetime
+  ) -> Iterator[Dict[str, Any]]:
+    """Parse raw lines into log entries within time range."""
     log_format = self.config["log_format"]
+    prefilter = self._prefilter.get(log_format)
+    bytes_parser = self._bytes_parsers.get(log_format)
+    include_raw = self.config.get("include_raw", False)
     
-    with open(self.config["file_path"], "r", encoding="utf-8") as file:
-      for line_num, line in enumerate(file, 1):
-        try:
-          parsed_entry = self._parse_log_line(line, log_format)
-          if parsed_entry and self._is_in_time_range(parsed_entry, start_time, end_time):
-            parsed_entry["line_number"] = line_num
-            parsed_entry["raw_line"] = line.strip()
-            yield parsed_entry
-        except Exception as e:
-          # Log parsing error but continue
+    for line_num, raw in enumerate(lines, 1):
+      # Parsers return None for lines they can't handle, so bad lines are skipped
+      # without an exception handler around the whole loop body
+      if bytes_parser is not None and raw.isascii():
+        line = None
+        parsed_entry = bytes_parser(raw)
+      else:
+        line = self._decode_line(raw)
+        if line is None or (prefilter is not None and not prefilter(line)):
           continue
+        parsed_entry = self._parse_log_line(line, log_format)
+      
+      if parsed_entry and self._is_in_time_range(parsed_entry, start_time, end_time):
+        if include_raw:
+          parsed_entry["line_number"] = line_num
+          parsed_entry["raw_line"] = (line if line is not None else raw.decode("ascii")).strip()
+        yield parsed_entry
   
-  def _parse_log_line(self, line: str, log_format: str) -> Dict[str, Any]:
-    """Parse log line based on format."""
+  def _decode_line(self, raw: bytes) -> Optional[str]:
+    """Decode a raw line, or return None if it isn't valid UTF-8."""
+    try:
+      return raw.decode("utf-8")
+    except UnicodeDecodeError:
+      return None
+  
+  def _iter_lines(self, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+    """Iterate over the file's lines, optionally within a byte range, through a read-only memory map."""
+    with open(self.config["file_path"], "rb") as file:
+      # Empty files cannot be mapped
+      if os.fstat(file.fileno()).st_size == 0:
+        return
+      
+      with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if hasattr(mmap, "MADV_SEQUENTIAL"):
+          mm.madvise(mmap.MADV_SEQUENTIAL)
+        
+        pos = start
+        limit = len(mm) if end is None else end
+        while pos < limit:
+          newline = mm.find(b"\n", pos, limit)
+          line_end = newline if newline != -1 else limit
+          
+          # Drop the newline, including the \r of CRLF line endings
+          stop = line_end - 1 if line_end > pos and mm[line_end - 1] == 0x0D else line_end
+          yield mm[pos:stop]
+          pos = line_end + 1
+  
+  def _parse_log_line(self, line: str, log_format: str) -> Optional[Dict[str, Any]]:
+    """Parse log line based on format, returning None if it doesn't parse."""
     if log_format == "json":
-      return json.loads(line.strip())
+      return self._parse_json(line)
     
     elif log_format == "apache_common":
       return self._parse_apache_common(line)
@@ -62,10 +560,34 @@ class LogConnector(BaseDataConnector):
     else:
       raise ValueError(f"Unsupported log format: {log_format}")
   
+  def _parse_json(self, line: str) -> Optional[Dict[str, Any]]:
+    """Parse a JSON log line holding an object."""
+    try:
+      entry = orjson.loads(line)
+    except orjson.JSONDecodeError:
+      # orjson rejects NaN/Infinity and integers beyond 64 bits, which json accepts
+      try:
+        entry = json.loads(line.strip())
+      except ValueError:
+        return None
+    
+    return entry if isinstance(entry, dict) else None
+  
+  def _parse_json_bytes(self, raw: bytes) -> Optional[Dict[str, Any]]:
+    """Parse an ASCII JSON log line holding an object."""
+    if raw.lstrip(ASCII_WHITESPACE)[:1] != b"{":
+      return None
+    
+    try:
+      entry = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+      return self._parse_json(raw.decode("ascii"))
+    
+    return entry if isinstance(entry, dict) else None
+  
   def _parse_apache_common(self, line: str) -> Dict[str, Any]:
     """Parse Apache Common Log Format."""
-    pattern = r'(\S+) (\S+) (\S+) \[([^\]]+)\] "([^"]*)" (\d+) (\S+)'
-    match = re.match(pattern, line)
+    match = APACHE_COMMON_PATTERN.match(line)
     
     if not match:
       return None
@@ -84,7 +606,7 @@ class LogConnector(BaseDataConnector):
     """Parse Nginx log format."""
     # Basic nginx format parsing
     parts = line.split()
-    if len(parts) < 7:
+    if len(parts) < 7 or (len(parts) > 8 and not parts[8].isdecimal()):
       return None
     
     return {
@@ -98,11 +620,7 @@ class LogConnector(BaseDataConnector):
   
   def _parse_custom(self, line: str) -> Dict[str, Any]:
     """Parse custom log format using regex."""
-    if "regex_pattern" not in self.config:
-      raise ValueError("Custom format requires regex_pattern in config")
-    
-    pattern = self.config["regex_pattern"]
-    match = re.match(pattern, line)
+    match = self._custom_pattern.match(line)
     
     if not match:
       return None
@@ -112,19 +630,38 @@ class LogConnector(BaseDataConnector):
   
   def _is_in_time_range(self, entry: Dict[str, Any], start_time: datetime, end_time: datetime) -> bool:
     """Check if log entry is within time range."""
-    timestamp_str = entry.get("timestamp")
+    return self._timestamp_in_range(entry.get("timestamp"), start_time, end_time)
+  
+  def _timestamp_in_range(self, timestamp_str: Optional[str], start_time: datetime, end_time: datetime) -> bool:
+    """Check if a raw timestamp is within time range."""
     if not timestamp_str:
       return True  # Include entries without timestamp
     
     try:
-      # Try different timestamp formats
-      for fmt in ["%d/%b/%Y:%H:%M:%S %z", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S"]:
-        try:
-          entry_time = datetime.strptime(timestamp_str, fmt)
-          return start_time <= entry_time <= end_time
-        except ValueError:
-          continue
+      entry_time = self._parse_timestamp(timestamp_str)
+      if entry_time is None:
+        return True  # Include if can't parse timestamp
       
-      return True  # Include if can't parse timestamp
+      return start_time <= entry_time <= end_time
     except Exception:
       return True
+  
+  def _parse_timestamp(self, timestamp_str: str) -> Optional[datetime]:
+    """Parse a timestamp in one of TIMESTAMP_FORMATS, or return None."""
+    if self._ts_parser is not None:
+      try:
+        return self._ts_parser(timestamp_str)
+      except ValueError:
+        self._ts_parser = None
+    
+    # Try different timestamp formats
+    for parser in TIMESTAMP_PARSERS:
+      try:
+        entry_time = parser(timestamp_str)
+      except ValueError:
+        continue
+      
+      self._ts_parser = parser
+      return entry_time
+    
+    return None
@@ -1,25 +1,92 @@
 """Database configuration and models."""
 
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Text, JSON, Boolean
+import os
+import tempfile
+from filelock import FileLock
+from sqlalchemy import create_engine, make_url, Column, Integer, String, DateTime, Text, Float, JSON, Boolean, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from datetime import datetime
 from app.config import settings
 
+
+def _pool_options(database_url: str) -> dict:
+  """Get connection pool options sized for concurrent request handling."""
+  # In-memory SQLite pools take no sizing arguments, and file databases
+  # serialize writes anyway
+  if make_url(database_url).get_backend_name() == "sqlite":
+    return {}
+  
+  # An external pooler such as PgBouncer already holds the server connections
+  if settings.db_null_pool:
+    return {"poolclass": NullPool}
+  
+  return {
+    "pool_size": settings.db_pool_size,
+    "max_overflow": settings.db_max_overflow,
+    "pool_timeout": settings.db_pool_timeout,
+    "pool_pre_ping": True,
+    "pool_recycle": settings.db_pool_recycle,
+    # Reuse the most recently returned connection so idle ones can be recycled
+    "pool_use_lifo": True
+  }
+
+
+# Async drivers for URLs that name a sync driver or none
+ASYNC_DRIVERS = {
+  "postgresql": "postgresql+asyncpg",
+  "postgresql+psycopg2": "postgresql+asyncpg",
+  "sqlite": "sqlite+aiosqlite"
+}
+
+
+def _async_url(database_url: str) -> str:
+  """Get the database URL with an asyncio driver."""
+  url = make_url(database_url)
+  return url.set(drivername=ASYNC_DRIVERS.get(url.drivername, url.drivername)).render_as_string(hide_password=False)
+
+
 # Database setup
-engine = create_engine(settings.database_url)
+engine = create_engine(settings.database_url, **_pool_options(settings.database_url))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Async engine for the API, so queries don't block the event loop
+async_engine = create_async_engine(_async_url(settings.database_url), **_pool_options(settings.database_url))
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, class_=AsyncSession, expire_on_commit=False)
+
+# Read-only endpoints use the replica when one is configured; their
+# sessions never write, so flushing is off
+async_read_engine = (
+  create_async_engine(_async_url(settings.database_read_url), **_pool_options(settings.database_read_url))
+  if settings.database_read_url else async_engine
+)
+AsyncReadSessionLocal = async_sessionmaker(
+  bind=async_read_engine,
+  class_=AsyncSession,
+  expire_on_commit=False,
+  autoflush=False
+)
 Base = declarative_base()
 
+# Stored as JSONB on PostgreSQL, which is parsed once on write and GIN-indexable
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
 
 class DataSource(Base):
   """Data source configuration."""
   __tablename__ = "data_sources"
+  __table_args__ = (
+    # Containment (@>) queries on config; needs JSONB, so PostgreSQL only
+    Index("ix_datasource_config_gin", "config", postgresql_using="gin").ddl_if(dialect="postgresql"),
+  )
   
   id = Column(Integer, primary_key=True, index=True)
   name = Column(String(100), nullable=False)
   type = Column(String(50), nullable=False)  # log, database, api
-  config = Column(JSON, nullable=False)
+  config = Column(JSONType, nullable=False)
   is_active = Column(Boolean, default=True)
   created_at = Column(DateTime, default=datetime.utcnow)
   updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -31,10 +98,10 @@ class AnalysisJob(Base):
   
   id = Column(Integer, primary_key=True, index=True)
   name = Column(String(200), nullable=False)
-  data_source_id = Column(Integer, nullable=False)
-  status = Column(String(50), default="pending")  # pending, running, completed, failed
-  config = Column(JSON, nullable=False)
-  result = Column(JSON)
+  data_source_id = Column(Integer, nullable=False, index=True)
+  status = Column(String(50), default="pending", index=True)  # pending, running, completed, failed
+  config = Column(JSONType, nullable=False)
+  result = Column(JSONType)
   error_message = Column(Text)
   created_at = Column(DateTime, default=datetime.utcnow)
   completed_at = Column(DateTime)
@@ -43,15 +110,20 @@ class AnalysisJob(Base):
 class Anomaly(Base):
   """Detected anomalies."""
   __tablename__ = "anomalies"
+  __table_args__ = (
+    # Also serves lookups by job_id alone
+    Index("ix_anomaly_job_severity", "job_id", "severity"),
+  )
   
   id = Column(Integer, primary_key=True, index=True)
   job_id = Column(Integer, nullable=False)
-  severity = Column(String(20), nullable=False)  # low, medium, high, critical
+  severity = Column(String(20), nullable=False, index=True)  # low, medium, high, critical
   category = Column(String(100), nullable=False)
   description = Column(Text, nullable=False)
-  data = Column(JSON)
-  detected_at = Column(DateTime, default=datetime.utcnow)
-  resolved = Column(Boolean, default=False)
+  confidence = Column(Float)
+  data = Column(JSONType)
+  detected_at = Column(DateTime, default=datetime.utcnow, index=True)
+  resolved = Column(Boolean, default=False, index=True)
 
 
 class Report(Base):
@@ -59,7 +131,7 @@ class Report(Base):
   __tablename__ = "reports"
   
   id = Column(Integer, primary_key=True, index=True)
-  job_id = Column(Integer, nullable=False)
+  job_id = Column(Integer, nullable=False, index=True)
   title = Column(String(200), nullable=False)
   content = Column(Text, nullable=False)
   format = Column(String(20), default="html")  # html, pdf, json
@@ -67,14 +139,20 @@ class Report(Base):
   created_at = Column(DateTime, default=datetime.utcnow)
 
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+def init_db() -> None:
+  """Create any missing tables."""
+  # Serialize table creation across the server's worker processes
+  with FileLock(os.path.join(tempfile.gettempdir(), "llm_pipeline_init_db.lock")):
+    Base.metadata.create_all(bind=engine)
+
+
+async def get_db_rw():
+  """Get a read-write database session."""
+  async with AsyncSessionLocal() as db:
+    yield db
 
 
-def get_db():
-  """Get database session."""
-  db = SessionLocal()
-  try:
+async def get_db_ro():
+  """Get a read-only database session."""
+  async with AsyncReadSessionLocal() as db:
     yield db
-  finally:
-    db.close()
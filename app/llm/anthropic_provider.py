@@ -3,6 +3,7 @@
 from typing import List, Dict, Any, Optional
 import anthropic
 from app.llm.base import BaseLLMProvider, LLMMessage, LLMResponse
+from app.llm.http import get_http_client
 from app.config import settings
 
 
@@ -14,7 +15,8 @@ class AnthropicProvider(BaseLLMProvider):
     if not settings.anthropic_api_key:
       raise ValueError("Anthropic API key is required")
     
-    self.client = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key)
+    # Share one pooled HTTP client across providers so connections are kept alive
+    self.client = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key, http_client=get_http_client())
   
   async def generate_response(
     self,
@@ -34,10 +36,13 @@ class AnthropicProvider(BaseLLMProvider):
       if msg.role == "system":
         system_message = msg.content
       else:
-        user_messages.append({
-          "role": msg.role,
-          "content": msg.content
-        })
+        user_messages.append(msg.model_dump())
+    
+    # Mark the system prompt as a cache breakpoint; prompts shorter than the
+    # model's minimum cacheable length are simply sent uncached. Off by default:
+    # list-form system prompts need an SDK newer than the pinned one
+    if system_message is not None and self.config.get("prompt_caching", False):
+      system_message = [{"type": "text", "text": system_message, "cache_control": {"type": "ephemeral"}}]
     
     try:
       response = await self.client.messages.create(
@@ -52,7 +57,9 @@ class AnthropicProvider(BaseLLMProvider):
         content=response.content[0].text,
         usage={
           "input_tokens": response.usage.input_tokens,
-          "output_tokens": response.usage.output_tokens
+          "output_tokens": response.usage.output_tokens,
+          "cache_creation_input_tokens": getattr(response.usage, "cache_creation_input_tokens", None),
+          "cache_read_input_tokens": getattr(response.usage, "cache_read_input_tokens", None)
         },
         model=response.model,
         finish_reason=response.stop_reason
@@ -1,12 +1,15 @@
 """Base LLM provider interface."""
 
+import asyncio
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class LLMMessage(BaseModel):
   """LLM message model."""
+  model_config = ConfigDict(frozen=True)
+  
   role: str  # system, user, assistant
   content: str
 
@@ -43,6 +46,23 @@ class BaseLLMProvider(ABC):
     """Generate response from LLM."""
     pass
   
+  async def generate_batch(
+    self,
+    requests: Dict[str, List[LLMMessage]],
+    model: Optional[str] = None,
+    temperature: float = 0.7,
+    max_tokens: Optional[int] = None
+  ) -> Dict[str, LLMResponse]:
+    """Generate responses for a batch of requests keyed by request id.
+
+    Providers without a batch API issue the requests concurrently in real time.
+    """
+    responses = await asyncio.gather(*(
+      self.generate_response(messages, model=model, temperature=temperature, max_tokens=max_tokens)
+      for messages in requests.values()
+    ))
+    return dict(zip(requests.keys(), responses))
+  
   @abstractmethod
   async def generate_embeddings(
     self,
@@ -0,0 +1,73 @@
+"""Batch API support for offline LLM workloads."""
+
+import io
+import json
+import asyncio
+from typing import Dict, Any, Optional
+from openai import AsyncOpenAI
+
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+def build_batch_file(requests: Dict[str, Dict[str, Any]]) -> bytes:
+  """Pack chat completion request bodies into a Batch API JSONL file."""
+  lines = [
+    json.dumps({
+      "custom_id": custom_id,
+      "method": "POST",
+      "url": BATCH_ENDPOINT,
+      "body": body
+    })
+    for custom_id, body in requests.items()
+  ]
+  return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+async def submit_batch(
+  client: AsyncOpenAI,
+  requests: Dict[str, Dict[str, Any]],
+  poll_interval: float = 30.0,
+  timeout: Optional[float] = None
+) -> Dict[str, Dict[str, Any]]:
+  """Submit chat completion requests as one batch and wait for the results.
+
+  Returns the response bodies keyed by ``custom_id``.
+  """
+  batch_file = await client.files.create(
+    file=("batch.jsonl", io.BytesIO(build_batch_file(requests))),
+    purpose="batch"
+  )
+  batch = await client.batches.create(
+    input_file_id=batch_file.id,
+    endpoint=BATCH_ENDPOINT,
+    completion_window="24h"
+  )
+
+  # Poll until the batch reaches a terminal state
+  loop = asyncio.get_running_loop()
+  deadline = loop.time() + timeout if timeout is not None else None
+  while batch.status not in TERMINAL_STATUSES:
+    if deadline is not None and loop.time() >= deadline:
+      await client.batches.cancel(batch.id)
+      raise TimeoutError(f"Batch {batch.id} did not complete within {timeout}s")
+    await asyncio.sleep(poll_interval)
+    batch = await client.batches.retrieve(batch.id)
+
+  if batch.status != "completed" or not batch.output_file_id:
+    raise Exception(f"Batch {batch.id} finished with status: {batch.status}")
+
+  output = await client.files.content(batch.output_file_id)
+
+  results = {}
+  for line in output.text.splitlines():
+    if not line.strip():
+      continue
+    record = json.loads(line)
+    response = record.get("response") or {}
+    if record.get("error") or response.get("status_code", 500) >= 400:
+      continue
+    results[record["custom_id"]] = response["body"]
+
+  return results
@@ -0,0 +1,90 @@
+"""Response cache for LLM calls."""
+
+import os
+import json
+import hashlib
+from collections import OrderedDict
+from typing import List, Optional
+import diskcache
+from app.config import settings
+from app.llm.base import LLMMessage, LLMResponse
+from app.llm.manager import LLMManager
+
+
+_MEMORY_CACHE_SIZE = 1024
+
+_memory_cache: "OrderedDict[str, LLMResponse]" = OrderedDict()
+_disk_cache: Optional[diskcache.Cache] = None
+
+
+def _get_disk_cache() -> diskcache.Cache:
+  """Get the shared on-disk cache, opening it on first use."""
+  global _disk_cache
+  if _disk_cache is None:
+    _disk_cache = diskcache.Cache(os.path.expanduser(settings.llm_cache_dir))
+  return _disk_cache
+
+
+def make_cache_key(
+  provider_name: Optional[str],
+  model: Optional[str],
+  temperature: float,
+  max_tokens: Optional[int],
+  messages: List[LLMMessage]
+) -> str:
+  """Hash a canonicalized LLM request into a cache key."""
+  request = {
+    "provider": provider_name,
+    "model": model,
+    "temperature": temperature,
+    "max_tokens": max_tokens,
+    "messages": [msg.model_dump() for msg in messages]
+  }
+  canonical = json.dumps(request, sort_keys=True, separators=(",", ":"))
+  return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+async def cached_generate(
+  llm_manager: LLMManager,
+  messages: List[LLMMessage],
+  provider_name: Optional[str] = None,
+  model: Optional[str] = None,
+  temperature: float = 0.7,
+  max_tokens: Optional[int] = None
+) -> LLMResponse:
+  """Generate a response, reusing a cached one for identical requests."""
+  if not settings.llm_cache_enabled:
+    return await llm_manager.generate_response(
+      messages=messages,
+      provider_name=provider_name,
+      model=model,
+      temperature=temperature,
+      max_tokens=max_tokens
+    )
+
+  key = make_cache_key(provider_name or llm_manager.default_provider, model, temperature, max_tokens, messages)
+
+  # In-process LRU first, then the on-disk cache
+  if key in _memory_cache:
+    _memory_cache.move_to_end(key)
+    return _memory_cache[key]
+
+  disk_cache = _get_disk_cache()
+  cached = disk_cache.get(key)
+  if cached is not None:
+    response = LLMResponse(**cached)
+  else:
+    response = await llm_manager.generate_response(
+      messages=messages,
+      provider_name=provider_name,
+      model=model,
+      temperature=temperature,
+      max_tokens=max_tokens
+    )
+    disk_cache.set(key, response.model_dump(), expire=settings.llm_cache_ttl)
+
+  _memory_cache[key] = response
+  if len(_memory_cache) > _MEMORY_CACHE_SIZE:
+    _memory_cache.popitem(last=False)
+
+  return response
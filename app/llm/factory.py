@@ -1,6 +1,7 @@
 """LLM provider factory."""
 
-from typing import Dict, Any, Type
+import json
+from typing import Dict, Any, Type, Tuple
 from app.llm.base import BaseLLMProvider
 from app.llm.openai_provider import OpenAIProvider
 from app.llm.anthropic_provider import AnthropicProvider
@@ -14,14 +15,20 @@ class LLMProviderFactory:
     "anthropic": AnthropicProvider
   }
   
+  # Providers are reused for identical configurations so their clients and caches are shared
+  _instances: Dict[Tuple[str, str], BaseLLMProvider] = {}
+  
   @classmethod
   def create_provider(cls, provider_type: str, config: Dict[str, Any]) -> BaseLLMProvider:
     """Create an LLM provider instance."""
     if provider_type not in cls._providers:
       raise ValueError(f"Unknown provider type: {provider_type}")
     
-    provider_class = cls._providers[provider_type]
-    return provider_class(config)
+    key = (provider_type, json.dumps(config, sort_keys=True, default=str))
+    if key not in cls._instances:
+      provider_class = cls._providers[provider_type]
+      cls._instances[key] = provider_class(config)
+    return cls._instances[key]
   
   @classmethod
   def get_available_providers(cls) -> list[str]:
@@ -32,3 +39,4 @@ class LLMProviderFactory:
   def register_provider(cls, provider_type: str, provider_class: Type[BaseLLMProvider]) -> None:
     """Register a new provider type."""
     cls._providers[provider_type] = provider_class
+    cls._instances = {key: provider for key, provider in cls._instances.items() if key[0] != provider_type}
@@ -0,0 +1,53 @@
+"""Shared HTTP client for LLM provider SDKs."""
+
+import asyncio
+import weakref
+from typing import Optional
+import httpx
+
+
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+HTTP_TIMEOUT = httpx.Timeout(600.0, connect=5.0)
+
+
+class _LoopLocalTransport(httpx.AsyncBaseTransport):
+  """Transport keeping a separate connection pool per event loop.
+  
+  Pooled connections are bound to the loop that opened them, and callers such as
+  the Celery worker run each task in a fresh loop via ``asyncio.run``.
+  """
+  
+  def __init__(self):
+    """Initialize with no pools; each loop gets one on its first request."""
+    self._transports: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncHTTPTransport]" = (
+      weakref.WeakKeyDictionary()
+    )
+  
+  def _get_transport(self) -> httpx.AsyncHTTPTransport:
+    """Get the connection pool of the running event loop."""
+    loop = asyncio.get_running_loop()
+    transport = self._transports.get(loop)
+    if transport is None:
+      transport = self._transports[loop] = httpx.AsyncHTTPTransport(limits=HTTP_LIMITS, http2=True)
+    return transport
+  
+  async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+    """Send a request through the running loop's pool."""
+    return await self._get_transport().handle_async_request(request)
+  
+  async def aclose(self) -> None:
+    """Close every pool."""
+    for transport in list(self._transports.values()):
+      await transport.aclose()
+    self._transports.clear()
+
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+  """Get the HTTP client shared by all providers, creating it on first use."""
+  global _http_client
+  if _http_client is None:
+    _http_client = httpx.AsyncClient(transport=_LoopLocalTransport(), timeout=HTTP_TIMEOUT)
+  return _http_client
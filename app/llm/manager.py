@@ -1,5 +1,6 @@
 """LLM manager for handling multiple providers."""
 
+import asyncio
 from typing import Dict, Any, List, Optional
 from app.llm.base import BaseLLMProvider, LLMMessage, LLMResponse
 from app.llm.factory import LLMProviderFactory
@@ -51,6 +52,73 @@ class LLMManager:
       max_tokens=max_tokens
     )
   
+  async def generate_response_raced(
+    self,
+    messages: List[LLMMessage],
+    providers: Optional[List[str]] = None,
+    hedge_delay: float = 0.0,
+    temperature: float = 0.7,
+    max_tokens: Optional[int] = None
+  ) -> LLMResponse:
+    """Generate a response from whichever of several providers answers first.
+    
+    Providers are started in order, each one ``hedge_delay`` seconds after the
+    previous or as soon as it fails. Each provider uses its default model.
+    """
+    remaining = [self.get_provider(name) for name in (providers or self.get_available_providers())]
+    if not remaining:
+      raise ValueError("No providers to race")
+    
+    pending = set()
+    last_error: Optional[BaseException] = None
+    try:
+      while remaining or pending:
+        if remaining:
+          provider = remaining.pop(0)
+          pending.add(asyncio.create_task(provider.generate_response(
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens
+          )))
+        
+        # Wait for a result, or until the next provider is due
+        done, pending = await asyncio.wait(
+          pending,
+          timeout=hedge_delay if remaining else None,
+          return_when=asyncio.FIRST_COMPLETED
+        )
+        response = None
+        for task in done:
+          error = task.exception()
+          if error is None:
+            response = task.result()
+          else:
+            last_error = error
+        if response is not None:
+          return response
+    finally:
+      for task in pending:
+        task.cancel()
+    
+    raise last_error
+  
+  async def generate_batch(
+    self,
+    requests: Dict[str, List[LLMMessage]],
+    provider_name: Optional[str] = None,
+    model: Optional[str] = None,
+    temperature: float = 0.7,
+    max_tokens: Optional[int] = None
+  ) -> Dict[str, LLMResponse]:
+    """Generate responses for a batch of requests using specified or default provider."""
+    provider = self.get_provider(provider_name)
+    return await provider.generate_batch(
+      requests=requests,
+      model=model,
+      temperature=temperature,
+      max_tokens=max_tokens
+    )
+  
   async def generate_embeddings(
     self,
     texts: List[str],
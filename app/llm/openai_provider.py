@@ -1,8 +1,13 @@
 """OpenAI LLM provider."""
 
-from typing import List, Dict, Any, Optional
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
 from openai import AsyncOpenAI
 from app.llm.base import BaseLLMProvider, LLMMessage, LLMResponse
+from app.llm.batch import submit_batch
+from app.llm.http import get_http_client
 from app.config import settings
 
 
@@ -14,7 +19,11 @@ class OpenAIProvider(BaseLLMProvider):
     if not settings.openai_api_key:
       raise ValueError("OpenAI API key is required")
     
-    self.client = AsyncOpenAI(api_key=settings.openai_api_key)
+    # Share one pooled HTTP client across providers so connections are kept alive
+    self.client = AsyncOpenAI(api_key=settings.openai_api_key, http_client=get_http_client())
+    
+    # Embeddings are deterministic per model and text, so repeats are served from memory
+    self._embed_cache: "OrderedDict[Tuple[str, str], List[float]]" = OrderedDict()
   
   async def generate_response(
     self,
@@ -26,11 +35,9 @@ class OpenAIProvider(BaseLLMProvider):
     """Generate response using OpenAI API."""
     model = model or self.config.get("default_model", "gpt-3.5-turbo")
     
-    # Convert messages to OpenAI format
-    openai_messages = [
-      {"role": msg.role, "content": msg.content}
-      for msg in messages
-    ]
+    # Messages are frozen and hold exactly the role and content fields, so
+    # their attribute dicts are already in OpenAI format
+    openai_messages = [msg.model_dump() for msg in messages]
     
     try:
       response = await self.client.chat.completions.create(
@@ -54,6 +61,47 @@ class OpenAIProvider(BaseLLMProvider):
     except Exception as e:
       raise Exception(f"OpenAI API error: {str(e)}")
   
+  async def generate_batch(
+    self,
+    requests: Dict[str, List[LLMMessage]],
+    model: Optional[str] = None,
+    temperature: float = 0.7,
+    max_tokens: Optional[int] = None
+  ) -> Dict[str, LLMResponse]:
+    """Generate responses using the OpenAI Batch API."""
+    model = model or self.config.get("default_model", "gpt-3.5-turbo")
+    
+    bodies = {}
+    for custom_id, messages in requests.items():
+      body = {
+        "model": model,
+        "messages": [msg.model_dump() for msg in messages],
+        "temperature": temperature
+      }
+      if max_tokens is not None:
+        body["max_tokens"] = max_tokens
+      bodies[custom_id] = body
+    
+    try:
+      results = await submit_batch(
+        self.client,
+        bodies,
+        poll_interval=self.config.get("batch_poll_interval", 30.0),
+        timeout=self.config.get("batch_timeout")
+      )
+    except Exception as e:
+      raise Exception(f"OpenAI batch error: {str(e)}")
+    
+    return {
+      custom_id: LLMResponse(
+        content=body["choices"][0]["message"]["content"],
+        usage=body.get("usage"),
+        model=body.get("model"),
+        finish_reason=body["choices"][0].get("finish_reason")
+      )
+      for custom_id, body in results.items()
+    }
+  
   async def generate_embeddings(
     self,
     texts: List[str],
@@ -61,14 +109,55 @@ class OpenAIProvider(BaseLLMProvider):
   ) -> List[List[float]]:
     """Generate embeddings using OpenAI API."""
     model = model or self.config.get("embedding_model", "text-embedding-ada-002")
+    keys = [
+      (model, hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest())
+      for text in texts
+    ]
+    
+    # Look up cached embeddings and collect the distinct texts still missing
+    embeddings = {}
+    missing = {}
+    for key, text in zip(keys, texts):
+      if key in embeddings or key in missing:
+        continue
+      if key in self._embed_cache:
+        self._embed_cache.move_to_end(key)
+        embeddings[key] = self._embed_cache[key]
+      else:
+        missing[key] = text
+    
+    if missing:
+      created = await self._create_embeddings(list(missing.values()), model)
+      cache_size = self.config.get("embedding_cache_size", 100_000)
+      for key, embedding in zip(missing, created):
+        embeddings[key] = self._embed_cache[key] = embedding
+        if len(self._embed_cache) > cache_size:
+          self._embed_cache.popitem(last=False)
+    
+    return [embeddings[key] for key in keys]
+  
+  async def _create_embeddings(self, texts: List[str], model: str) -> List[List[float]]:
+    """Request embeddings from the API in concurrent chunks."""
+    batch_size = self.config.get("embedding_batch_size", 96)
+    
+    # Split large inputs into request-sized chunks sent concurrently
+    semaphore = asyncio.Semaphore(self.config.get("embedding_concurrency", 8))
+    
+    async def embed_chunk(chunk: List[str]) -> List[List[float]]:
+      async with semaphore:
+        response = await self.client.embeddings.create(
+          model=model,
+          input=chunk
+        )
+      return [embedding.embedding for embedding in response.data]
     
     try:
-      response = await self.client.embeddings.create(
-        model=model,
-        input=texts
-      )
+      results = await asyncio.gather(*(
+        embed_chunk(texts[i:i + batch_size])
+        for i in range(0, len(texts), batch_size)
+      ))
       
-      return [embedding.embedding for embedding in response.data]
+      return [embedding for chunk in results for embedding in chunk]
     
     except Exception as e:
       raise Exception(f"OpenAI embeddings error: {str(e)}")
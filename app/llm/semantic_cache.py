@@ -0,0 +1,84 @@
+"""Similarity-based response cache for LLM calls over log content."""
+
+import re
+import time
+import zlib
+from typing import List, Optional
+import numpy as np
+from app.config import settings
+from app.llm.base import LLMMessage, LLMResponse
+from app.llm.cache import cached_generate, make_cache_key, _get_disk_cache
+from app.llm.manager import LLMManager
+
+
+TOKEN_PATTERN = re.compile(r"[A-Za-z_]+|\d+|[^\sA-Za-z_\d]")
+
+_EMBEDDING_DIM = 512
+_ENTRIES_PER_SCOPE = 256
+
+
+def embed_text(text: str) -> np.ndarray:
+  """Embed text as a unit-length hashed bag of tokens and token bigrams."""
+  tokens = TOKEN_PATTERN.findall(text.lower())
+  features = tokens + [f"{first} {second}" for first, second in zip(tokens, tokens[1:])]
+
+  # crc32 rather than hash() so vectors match across processes
+  buckets = np.fromiter((zlib.crc32(feature.encode("utf-8")) for feature in features), dtype=np.uint32, count=len(features))
+  vector = np.bincount(buckets % _EMBEDDING_DIM, minlength=_EMBEDDING_DIM).astype(np.float32)
+  norm = np.linalg.norm(vector)
+  return vector / norm if norm > 0 else vector
+
+
+async def semantic_cached_generate(
+  llm_manager: LLMManager,
+  messages: List[LLMMessage],
+  provider_name: Optional[str] = None,
+  model: Optional[str] = None,
+  temperature: float = 0.7,
+  max_tokens: Optional[int] = None
+) -> LLMResponse:
+  """Generate a response, reusing the cached one for a sufficiently similar request.
+
+  Requests are compared only with earlier ones sharing the provider, model,
+  sampling parameters and system prompt, by cosine similarity of their other messages.
+  """
+  if not settings.llm_semantic_cache_enabled:
+    return await cached_generate(llm_manager, messages, provider_name, model, temperature, max_tokens)
+
+  provider_name = provider_name or llm_manager.default_provider
+  system_messages = [msg for msg in messages if msg.role == "system"]
+  scope = "semantic:" + make_cache_key(provider_name, model, temperature, max_tokens, system_messages)
+  vector = embed_text("\n".join(msg.content for msg in messages if msg.role != "system"))
+
+  disk_cache = _get_disk_cache()
+  entries = disk_cache.get(scope)
+  now = time.time()
+  if entries is not None:
+    live = entries["expires"] > now
+    if live.any():
+      similarities = entries["vectors"][live] @ vector
+      best = int(similarities.argmax())
+      if similarities[best] >= settings.llm_semantic_cache_threshold:
+        return LLMResponse(**entries["responses"][np.flatnonzero(live)[best]])
+
+  response = await cached_generate(llm_manager, messages, provider_name, model, temperature, max_tokens)
+
+  # Keep the most recent entries of the scope; expired ones age out the same way.
+  # The scope is re-read inside the transaction so concurrent callers'
+  # entries are not overwritten, without holding it across the LLM call
+  ttl = settings.llm_cache_ttl if settings.llm_cache_ttl is not None else np.inf
+  with disk_cache.transact():
+    entries = disk_cache.get(scope)
+    if entries is None:
+      entries = {
+        "vectors": np.empty((0, _EMBEDDING_DIM), dtype=np.float32),
+        "expires": np.empty(0),
+        "responses": []
+      }
+    disk_cache.set(scope, {
+      "vectors": np.vstack([entries["vectors"], vector])[-_ENTRIES_PER_SCOPE:],
+      "expires": np.append(entries["expires"], now + ttl)[-_ENTRIES_PER_SCOPE:],
+      "responses": (entries["responses"] + [response.model_dump()])[-_ENTRIES_PER_SCOPE:]
+    })
+
+  return response
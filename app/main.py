@@ -1,20 +1,24 @@
 """Main FastAPI application."""
 
-from fastapi import FastAPI, Depends, HTTPException, BackgroundTasks
+from fastapi import FastAPI, Depends, HTTPException, Query
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.responses import HTMLResponse, FileResponse, ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from fastapi.middleware.gzip import GZipMiddleware
+from sqlalchemy import select, func, Select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Dict, Any, Optional
 import os
-from datetime import datetime, timedelta
+import asyncio
+from datetime import datetime
+import redis.asyncio as aioredis
+from cachetools import TTLCache
 
-from app.config import settings
-from app.database import get_db, DataSource, AnalysisJob, Anomaly, Report
-from app.data_connectors.factory import DataConnectorFactory
+from app.config import settings, ANOMALIES_CHANNEL
+from app.celery_app import celery_app
+from app.database import init_db, get_db_ro, get_db_rw, DataSource, AnalysisJob, Anomaly, Report
 from app.llm.factory import LLMProviderFactory
 from app.llm.manager import LLMManager
-from app.agents.anomaly_detector import AnomalyDetectorAgent
 from app.reports.factory import ReportGeneratorFactory
 from app.reports.base import ReportData
 
@@ -22,7 +26,8 @@ from app.reports.base import ReportData
 app = FastAPI(
   title="LLM Integration Pipeline",
   description="AI-powered data analysis and anomaly detection pipeline",
-  version="1.0.0"
+  version="1.0.0",
+  default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -34,187 +39,79 @@ app.add_middleware(
   allow_headers=["*"],
 )
 
+# Compress responses large enough to benefit, such as the dashboard and long lists
+app.add_middleware(GZipMiddleware, minimum_size=512)
+
+
+class CachedStaticFiles(StaticFiles):
+  """Static files that browsers may cache for a day without revalidating."""
+  
+  def file_response(self, *args, **kwargs) -> Response:
+    """Serve a file with long-lived cache headers."""
+    # Assets are referenced with a ?v= query, bumped whenever they change
+    response = super().file_response(*args, **kwargs)
+    response.headers["Cache-Control"] = "public, max-age=86400, immutable"
+    return response
+
+
 # Mount static files
-if not os.path.exists("static"):
-  os.makedirs("static")
-app.mount("/static", StaticFiles(directory="static"), name="static")
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static")
+app.mount("/static", CachedStaticFiles(directory=STATIC_DIR), name="static")
 
 
-@app.get("/", response_class=HTMLResponse)
-async def dashboard():
-  """Main dashboard page."""
-  return """
+@app.on_event("startup")
+async def create_tables():
+  """Create database tables on startup."""
+  init_db()
+
+
+# Anomaly queries by (severity, limit); open dashboards poll the same few
+_anomaly_cache: TTLCache = TTLCache(maxsize=256, ttl=10)
+_anomaly_watch_task: Optional[asyncio.Task] = None
+_anomaly_watch_client: Optional[aioredis.Redis] = None
+
+
+async def _watch_anomaly_updates(client: aioredis.Redis) -> None:
+  """Clear the anomaly cache whenever the worker saves new anomalies."""
+  while True:
+    try:
+      async with client.pubsub() as pubsub:
+        await pubsub.subscribe(ANOMALIES_CHANNEL)
+        async for message in pubsub.listen():
+          if message["type"] == "message":
+            _anomaly_cache.clear()
+    except Exception as e:
+      # Updates sent while disconnected are lost, but the TTL bounds the staleness
+      print(f"Anomaly update listener failed, retrying: {e}")
+      await asyncio.sleep(5)
+
+
+@app.on_event("startup")
+async def start_anomaly_watch():
+  """Start listening for anomaly updates."""
+  global _anomaly_watch_task, _anomaly_watch_client
+  _anomaly_watch_client = aioredis.from_url(settings.redis_url)
+  _anomaly_watch_task = asyncio.create_task(_watch_anomaly_updates(_anomaly_watch_client))
+
+
+@app.on_event("shutdown")
+async def stop_anomaly_watch():
+  """Stop listening for anomaly updates."""
+  if _anomaly_watch_task is not None:
+    _anomaly_watch_task.cancel()
+    await asyncio.gather(_anomaly_watch_task, return_exceptions=True)
+  if _anomaly_watch_client is not None:
+    await _anomaly_watch_client.aclose()
+
+
+DASHBOARD_HTML = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>LLM Integration Pipeline Dashboard</title>
-    <style>
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-        
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            color: #333;
-        }
-        
-        .container {
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 20px;
-        }
-        
-        .header {
-            text-align: center;
-            margin-bottom: 40px;
-            color: white;
-        }
-        
-        .header h1 {
-            font-size: 3rem;
-            margin-bottom: 10px;
-            font-weight: 700;
-            text-shadow: 0 2px 4px rgba(0,0,0,0.3);
-        }
-        
-        .header p {
-            font-size: 1.2rem;
-            opacity: 0.9;
-        }
-        
-        .dashboard-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
-            gap: 30px;
-            margin-bottom: 40px;
-        }
-        
-        .card {
-            background: rgba(255, 255, 255, 0.95);
-            backdrop-filter: blur(10px);
-            border-radius: 20px;
-            padding: 30px;
-            box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
-            border: 1px solid rgba(255, 255, 255, 0.2);
-            transition: transform 0.3s ease, box-shadow 0.3s ease;
-        }
-        
-        .card:hover {
-            transform: translateY(-5px);
-            box-shadow: 0 12px 40px rgba(0, 0, 0, 0.15);
-        }
-        
-        .card h2 {
-            color: #2c3e50;
-            margin-bottom: 20px;
-            font-size: 1.5rem;
-            font-weight: 600;
-        }
-        
-        .card p {
-            color: #7f8c8d;
-            line-height: 1.6;
-            margin-bottom: 20px;
-        }
-        
-        .btn {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            border: none;
-            padding: 12px 24px;
-            border-radius: 25px;
-            font-size: 1rem;
-            font-weight: 600;
-            cursor: pointer;
-            transition: all 0.3s ease;
-            text-decoration: none;
-            display: inline-block;
-            text-align: center;
-        }
-        
-        .btn:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 4px 15px rgba(0, 0, 0, 0.2);
-        }
-        
-        .btn-secondary {
-            background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
-        }
-        
-        .btn-success {
-            background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%);
-        }
-        
-        .stats-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 20px;
-            margin-bottom: 30px;
-        }
-        
-        .stat-card {
-            background: rgba(255, 255, 255, 0.9);
-            border-radius: 15px;
-            padding: 25px;
-            text-align: center;
-            box-shadow: 0 4px 20px rgba(0, 0, 0, 0.08);
-        }
-        
-        .stat-number {
-            font-size: 2.5rem;
-            font-weight: 700;
-            color: #2c3e50;
-            margin-bottom: 5px;
-        }
-        
-        .stat-label {
-            color: #7f8c8d;
-            font-size: 0.9rem;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-        }
-        
-        .api-section {
-            background: rgba(255, 255, 255, 0.95);
-            border-radius: 20px;
-            padding: 30px;
-            margin-top: 30px;
-        }
-        
-        .api-endpoint {
-            background: #f8f9fa;
-            border-radius: 10px;
-            padding: 15px;
-            margin: 10px 0;
-            font-family: 'Courier New', monospace;
-            border-left: 4px solid #667eea;
-        }
-        
-        .method {
-            color: #28a745;
-            font-weight: bold;
-        }
-        
-        .endpoint {
-            color: #007bff;
-        }
-        
-        @media (max-width: 768px) {
-            .header h1 {
-                font-size: 2rem;
-            }
-            
-            .dashboard-grid {
-                grid-template-columns: 1fr;
-            }
-        }
-    </style>
+    <link rel="stylesheet" href="/static/app.css?v=1">
 </head>
 <body>
     <div class="container">
@@ -298,48 +195,57 @@ async def dashboard():
         </div>
     </div>
     
-    <script>
-        // Load dashboard statistics
-        async function loadStats() {
-            try {
-                const [sourcesRes, jobsRes, anomaliesRes, reportsRes] = await Promise.all([
-                    fetch('/api/data-sources'),
-                    fetch('/api/analysis-jobs'),
-                    fetch('/api/anomalies'),
-                    fetch('/api/reports')
-                ]);
-                
-                const sources = await sourcesRes.json();
-                const jobs = await jobsRes.json();
-                const anomalies = await anomaliesRes.json();
-                const reports = await reportsRes.json();
-                
-                document.getElementById('data-sources').textContent = sources.length || 0;
-                document.getElementById('analysis-jobs').textContent = jobs.length || 0;
-                document.getElementById('anomalies').textContent = anomalies.length || 0;
-                document.getElementById('reports').textContent = reports.length || 0;
-            } catch (error) {
-                console.error('Failed to load stats:', error);
-            }
-        }
-        
-        // Load stats on page load
-        loadStats();
-        
-        // Refresh stats every 30 seconds
-        setInterval(loadStats, 30000);
-    </script>
+    <script src="/static/app.js?v=1"></script>
 </body>
 </html>
-  """
+"""
+
+# The page is static, so it's encoded once rather than on every request
+DASHBOARD_BODY = DASHBOARD_HTML.encode("utf-8")
+
+
+@app.get("/", response_class=HTMLResponse)
+async def dashboard():
+  """Main dashboard page."""
+  return HTMLResponse(DASHBOARD_BODY, headers={"Cache-Control": "public, max-age=60"})
+
+
+def _paginate(query: Select, model: Any, limit: int, offset: int, before_id: Optional[int]) -> Select:
+  """Order a select newest first and take one page of it."""
+  # Paging by before_id (the last id seen) stays fast deep into large tables
+  if before_id is not None:
+    query = query.where(model.id < before_id)
+  return query.order_by(model.id.desc()).offset(offset).limit(limit)
 
 
 # API Endpoints
 
+@app.get("/api/stats")
+async def get_stats(db: AsyncSession = Depends(get_db_ro)):
+  """Get row counts for the dashboard."""
+  # One statement counting every table, instead of fetching the rows
+  counts = select(*[
+    select(func.count()).select_from(model).scalar_subquery().label(name)
+    for name, model in [
+      ("data_sources", DataSource),
+      ("analysis_jobs", AnalysisJob),
+      ("anomalies", Anomaly),
+      ("reports", Report)
+    ]
+  ])
+  return dict((await db.execute(counts)).one()._mapping)
+
+
 @app.get("/api/data-sources")
-async def get_data_sources(db: Session = Depends(get_db)):
-  """Get all data sources."""
-  return db.query(DataSource).all()
+async def get_data_sources(
+  limit: int = Query(100, ge=1, le=1000),
+  offset: int = Query(0, ge=0),
+  before_id: Optional[int] = None,
+  db: AsyncSession = Depends(get_db_ro)
+):
+  """Get data sources, newest first."""
+  query = _paginate(select(DataSource), DataSource, limit, offset, before_id)
+  return (await db.execute(query)).scalars().all()
 
 
 @app.post("/api/data-sources")
@@ -347,7 +253,7 @@ async def create_data_source(
   name: str,
   type: str,
   config: Dict[str, Any],
-  db: Session = Depends(get_db)
+  db: AsyncSession = Depends(get_db_rw)
 ):
   """Create a new data source."""
   data_source = DataSource(
@@ -356,15 +262,21 @@ async def create_data_source(
     config=config
   )
   db.add(data_source)
-  db.commit()
-  db.refresh(data_source)
+  await db.commit()
+  await db.refresh(data_source)
   return data_source
 
 
 @app.get("/api/analysis-jobs")
-async def get_analysis_jobs(db: Session = Depends(get_db)):
-  """Get all analysis jobs."""
-  return db.query(AnalysisJob).all()
+async def get_analysis_jobs(
+  limit: int = Query(100, ge=1, le=1000),
+  offset: int = Query(0, ge=0),
+  before_id: Optional[int] = None,
+  db: AsyncSession = Depends(get_db_ro)
+):
+  """Get analysis jobs, newest first."""
+  query = _paginate(select(AnalysisJob), AnalysisJob, limit, offset, before_id)
+  return (await db.execute(query)).scalars().all()
 
 
 @app.post("/api/analysis-jobs")
@@ -372,8 +284,7 @@ async def create_analysis_job(
   name: str,
   data_source_id: int,
   config: Dict[str, Any],
-  background_tasks: BackgroundTasks,
-  db: Session = Depends(get_db)
+  db: AsyncSession = Depends(get_db_rw)
 ):
   """Create and start a new analysis job."""
   job = AnalysisJob(
@@ -383,11 +294,12 @@ async def create_analysis_job(
     status="pending"
   )
   db.add(job)
-  db.commit()
-  db.refresh(job)
+  await db.commit()
+  await db.refresh(job)
   
-  # Start analysis in background
-  background_tasks.add_task(run_analysis_job, job.id, db)
+  # Run the analysis on a Celery worker rather than in the API process,
+  # enqueued by name so the API never imports the worker and its detector
+  celery_app.send_task("app.worker.run_analysis_job", args=[job.id])
   
   return job
 
@@ -395,43 +307,61 @@ async def create_analysis_job(
 @app.get("/api/anomalies")
 async def get_anomalies(
   severity: Optional[str] = None,
-  limit: int = 100,
-  db: Session = Depends(get_db)
+  limit: int = Query(100, ge=1, le=1000),
+  db: AsyncSession = Depends(get_db_ro)
 ):
   """Get detected anomalies."""
-  query = db.query(Anomaly)
+  key = (severity, limit)
+  anomalies = _anomaly_cache.get(key)
+  if anomalies is not None:
+    return anomalies
+  
+  # Plain column rows, so cached results hold no session or ORM state
+  query = select(*Anomaly.__table__.columns)
   
   if severity:
-    query = query.filter(Anomaly.severity == severity)
+    query = query.where(Anomaly.severity == severity)
   
-  return query.limit(limit).all()
+  result = await db.execute(query.limit(limit))
+  anomalies = _anomaly_cache[key] = [dict(row) for row in result.mappings()]
+  return anomalies
 
 
 @app.get("/api/reports")
-async def get_reports(db: Session = Depends(get_db)):
-  """Get all generated reports."""
-  return db.query(Report).all()
+async def get_reports(
+  limit: int = Query(100, ge=1, le=1000),
+  offset: int = Query(0, ge=0),
+  before_id: Optional[int] = None,
+  db: AsyncSession = Depends(get_db_ro)
+):
+  """Get generated reports, newest first."""
+  query = _paginate(select(Report), Report, limit, offset, before_id)
+  return (await db.execute(query)).scalars().all()
 
 
 @app.post("/api/reports/generate")
 async def generate_report(
   job_id: int,
   format: str = "html",
-  db: Session = Depends(get_db)
+  db: AsyncSession = Depends(get_db_rw)
 ):
   """Generate a report for a specific job."""
-  job = db.query(AnalysisJob).filter(AnalysisJob.id == job_id).first()
+  job = await db.get(AnalysisJob, job_id)
   if not job:
     raise HTTPException(status_code=404, detail="Job not found")
   
   # Get anomalies for this job
-  anomalies = db.query(Anomaly).filter(Anomaly.job_id == job_id).all()
+  # Plain column rows, without ORM instances and their state
+  result = await db.execute(
+    select(*Anomaly.__table__.columns).where(Anomaly.job_id == job_id)
+  )
+  anomalies = [dict(row) for row in result.mappings()]
   
   # Create report data
   report_data = ReportData(
     title=f"Analysis Report for {job.name}",
     summary=f"Analysis completed with {len(anomalies)} anomalies detected",
-    anomalies=[anomaly.__dict__ for anomaly in anomalies],
+    anomalies=anomalies,
     metrics={"total_anomalies": len(anomalies)},
     recommendations=["Review detected anomalies", "Implement monitoring"],
     generated_at=datetime.utcnow(),
@@ -451,82 +381,20 @@ async def generate_report(
     format=format
   )
   db.add(report)
-  db.commit()
-  db.refresh(report)
+  await db.commit()
+  await db.refresh(report)
   
   return {"report_id": report.id, "content": content}
 
 
-async def run_analysis_job(job_id: int, db: Session):
-  """Run analysis job in background."""
-  try:
-    # Get job
-    job = db.query(AnalysisJob).filter(AnalysisJob.id == job_id).first()
-    if not job:
-      return
-    
-    # Update status
-    job.status = "running"
-    db.commit()
-    
-    # Get data source
-    data_source = db.query(DataSource).filter(DataSource.id == job.data_source_id).first()
-    if not data_source:
-      job.status = "failed"
-      job.error_message = "Data source not found"
-      db.commit()
-      return
-    
-    # Create connector
-    connector = DataConnectorFactory.create_connector(
-      data_source.type,
-      data_source.config
-    )
-    
-    # Fetch data
-    end_time = datetime.utcnow()
-    start_time = end_time - timedelta(hours=24)  # Last 24 hours
-    
-    data = list(connector.fetch_data(start_time, end_time))
-    
-    # Create anomaly detector
-    detector = AnomalyDetectorAgent({
-      "llm_provider": "openai",
-      "sensitivity": "medium"
-    })
-    
-    # Analyze data
-    result = await detector.analyze(data)
-    
-    # Save anomalies
-    for anomaly in result.anomalies:
-      db_anomaly = Anomaly(
-        job_id=job_id,
-        severity=anomaly.severity,
-        category=anomaly.category,
-        description=anomaly.description,
-        data=anomaly.data,
-        confidence=anomaly.confidence
-      )
-      db.add(db_anomaly)
-    
-    # Update job status
-    job.status = "completed"
-    job.result = {
-      "anomalies_count": len(result.anomalies),
-      "summary": result.summary,
-      "metrics": result.metrics
-    }
-    job.completed_at = datetime.utcnow()
-    db.commit()
-    
-  except Exception as e:
-    # Update job status
-    job.status = "failed"
-    job.error_message = str(e)
-    db.commit()
-
-
 if __name__ == "__main__":
   import uvicorn
-  uvicorn.run(app, host="0.0.0.0", port=8000)
+  # Multiple workers need the app as an import string rather than an object
+  uvicorn.run(
+    "app.main:app",
+    host="0.0.0.0",
+    port=8000,
+    loop="uvloop",
+    http="httptools",
+    workers=settings.web_concurrency
+  )
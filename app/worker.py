@@ -1,29 +1,83 @@
 """Celery worker for background tasks."""
 
-from celery import Celery
-from app.config import settings
-from app.database import SessionLocal
+import redis
+from celery.signals import worker_init, worker_process_shutdown
+from sqlalchemy import insert, select
+from app.config import settings, ANOMALIES_CHANNEL
+from app.celery_app import celery_app
+from app.database import SessionLocal, init_db, DataSource, AnalysisJob, Anomaly, Report
 from app.data_connectors.factory import DataConnectorFactory
-from app.agents.anomaly_detector import AnomalyDetectorAgent
+from app.agents.anomaly_detector import AnomalyDetectorAgent, shutdown_process_pool
 from app.reports.factory import ReportGeneratorFactory
 from app.reports.base import ReportData
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 import asyncio
 
-# Create Celery app
-celery_app = Celery(
-  "llm_pipeline",
-  broker=settings.redis_url,
-  backend=settings.redis_url
-)
 
-celery_app.conf.update(
-  task_serializer="json",
-  accept_content=["json"],
-  result_serializer="json",
-  timezone="UTC",
-  enable_utc=True,
-)
+_redis_client: Optional[redis.Redis] = None
+
+
+def _get_redis() -> redis.Redis:
+  """Get the Redis client for notifications, creating it on first use."""
+  global _redis_client
+  if _redis_client is None:
+    _redis_client = redis.Redis.from_url(settings.redis_url)
+  return _redis_client
+
+
+def _notify_anomalies_updated() -> None:
+  """Tell API processes to drop their cached anomaly queries."""
+  try:
+    _get_redis().publish(ANOMALIES_CHANNEL, "")
+  except redis.RedisError as e:
+    # The API cache's TTL still bounds how stale it gets
+    print(f"Failed to publish anomaly update: {e}")
+
+
+# The detector holds only its configuration, so every job shares one
+_detector = AnomalyDetectorAgent({
+  "llm_provider": "openai",
+  "sensitivity": "medium"
+})
+
+
+@worker_init.connect
+def create_tables(**kwargs):
+  """Create database tables when the worker starts."""
+  init_db()
+
+
+@worker_process_shutdown.connect
+def stop_process_pool(**kwargs):
+  """Shut down the detector's process pool when a worker process exits."""
+  shutdown_process_pool()
+
+
+def _chunked(entries: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+  """Split entries into lists of at most size entries."""
+  iterator = iter(entries)
+  while True:
+    batch = list(islice(iterator, size))
+    if not batch:
+      return
+    yield batch
+
+
+def _prefetched(batches: Iterator[List[Dict[str, Any]]]) -> Iterator[List[Dict[str, Any]]]:
+  """Yield batches while the next one is read in a background thread."""
+  # Reading is I/O-bound, so it overlaps with analyzing the previous batch
+  with ThreadPoolExecutor(max_workers=1) as reader:
+    pending = reader.submit(next, batches, None)
+    while True:
+      batch = pending.result()
+      if batch is None:
+        return
+      pending = reader.submit(next, batches, None)
+      yield batch
 
 
 @celery_app.task
@@ -59,28 +113,39 @@ def run_analysis_job(job_id: int):
     end_time = datetime.utcnow()
     start_time = end_time - timedelta(hours=24)  # Last 24 hours
     
-    data = list(connector.fetch_data(start_time, end_time))
-    
-    # Create anomaly detector
-    detector = AnomalyDetectorAgent({
-      "llm_provider": "openai",
-      "sensitivity": "medium"
-    })
-    
-    # Analyze data
-    result = asyncio.run(detector.analyze(data))
-    
-    # Save anomalies
-    for anomaly in result.anomalies:
-      db_anomaly = Anomaly(
-        job_id=job_id,
-        severity=anomaly.severity,
-        category=anomaly.category,
-        description=anomaly.description,
-        data=anomaly.data,
-        confidence=anomaly.confidence
-      )
-      db.add(db_anomaly)
+    # Analyze the entries in bounded batches rather than loading the whole
+    # range, saving each batch's anomalies as soon as it is analyzed
+    results = []
+    try:
+      batches = _chunked(connector.fetch_data(start_time, end_time), job.config.get("batch_size", 500))
+      # Closing the prefetcher waits for its pending read, so the connector
+      # is never closed while the reader thread is still using it
+      with closing(_prefetched(batches)) as prefetched:
+        for batch in prefetched:
+          batch_result = asyncio.run(_detector.analyze(batch))
+          
+          # One multi-row INSERT rather than an ORM object and statement per anomaly
+          if batch_result.anomalies:
+            db.execute(insert(Anomaly), [
+              {
+                "job_id": job_id,
+                "severity": anomaly.severity,
+                "category": anomaly.category,
+                "description": anomaly.description,
+                "data": anomaly.data,
+                "confidence": anomaly.confidence
+              }
+              for anomaly in batch_result.anomalies
+            ])
+          db.commit()
+          if batch_result.anomalies:
+            _notify_anomalies_updated()
+          
+          results.append(batch_result)
+    finally:
+      connector.close()
+    
+    result = _detector.merge_results(results)
     
     # Update job status
     job.status = "completed"
@@ -121,13 +186,17 @@ def generate_report_task(job_id: int, format: str = "html"):
       return {"status": "failed", "error": "Job not found"}
     
     # Get anomalies for this job
-    anomalies = db.query(Anomaly).filter(Anomaly.job_id == job_id).all()
+    # Plain column rows, without ORM instances and their state
+    result = db.execute(
+      select(*Anomaly.__table__.columns).where(Anomaly.job_id == job_id)
+    )
+    anomalies = [dict(row) for row in result.mappings()]
     
     # Create report data
     report_data = ReportData(
       title=f"Analysis Report for {job.name}",
       summary=f"Analysis completed with {len(anomalies)} anomalies detected",
-      anomalies=[anomaly.__dict__ for anomaly in anomalies],
+      anomalies=anomalies,
       metrics={"total_anomalies": len(anomalies)},
       recommendations=["Review detected anomalies", "Implement monitoring"],
       generated_at=datetime.utcnow(),
@@ -7,7 +7,9 @@
 """
 
 import asyncio
-import json
+import aiofiles
+import numpy as np
+import pandas as pd
 from datetime import datetime, timedelta
 from pathlib import Path
 import sys
@@ -35,9 +37,9 @@ async def analyze_game_logs():
   log_file = Path("examples/game_logs.json")
   log_file.parent.mkdir(exist_ok=True)
   
-  with open(log_file, "w") as f:
-    for log in sample_logs:
-      f.write(json.dumps(log) + "\n")
+  # כתיבה אחת של כל הקובץ, בלי לחסום את לולאת האירועים
+  async with aiofiles.open(log_file, "w") as f:
+    await f.write(sample_logs.to_json(orient="records", lines=True))
   
   print(f"✅ נוצר קובץ לוגים: {log_file}")
   
@@ -120,8 +122,8 @@ async def analyze_game_logs():
   html_content = await html_generator.generate_report(report_data)
   
   html_file = Path("examples/game_analysis_report.html")
-  with open(html_file, "w", encoding="utf-8") as f:
-    f.write(html_content)
+  async with aiofiles.open(html_file, "w", encoding="utf-8") as f:
+    await f.write(html_content)
   
   print(f"✅ דוח HTML נוצר: {html_file}")
   
@@ -130,8 +132,8 @@ async def analyze_game_logs():
   json_content = await json_generator.generate_report(report_data)
   
   json_file = Path("examples/game_analysis_report.json")
-  with open(json_file, "w", encoding="utf-8") as f:
-    f.write(json_content)
+  async with aiofiles.open(json_file, "w", encoding="utf-8") as f:
+    await f.write(json_content)
   
   print(f"✅ דוח JSON נוצר: {json_file}")
   
@@ -149,7 +151,6 @@ async def analyze_game_logs():
 
 def create_sample_game_logs():
   """יוצר לוגים לדוגמה של משחק."""
-  logs = []
   base_time = datetime.now() - timedelta(hours=24)
   
   # דוגמאות לוגים של משחק
@@ -165,35 +166,32 @@ def create_sample_game_logs():
     {"level": "FATAL", "message": "Server crash", "status": 500},
   ]
   
-  for i in range(1000):
-    # הוספת וריאציה בזמן
-    timestamp = base_time + timedelta(
-      minutes=i // 10,
-      seconds=i % 60
-    )
-    
-    # בחירת אירוע
-    event = game_events[i % len(game_events)]
-    
-    # הוספת אנומליות לדוגמה
-    if i % 50 == 0:  # כל 50 רשומות
-      event = {"level": "ERROR", "message": "CRITICAL: Server overload", "status": 500}
-    elif i % 100 == 0:  # כל 100 רשומות
-      event = {"level": "WARN", "message": "Suspicious player behavior detected", "status": 200}
-    
-    log_entry = {
-      "timestamp": timestamp.isoformat(),
-      "level": event["level"],
-      "message": event["message"],
-      "status": event["status"],
-      "response_time": 0.1 + (i % 10) * 0.1,
-      "player_id": f"player_{1000 + i}",
-      "game_room": f"room_{i % 10}",
-      "ip_address": f"192.168.1.{i % 254 + 1}",
-      "user_agent": "GameClient/1.0"
-    }
-    
-    logs.append(log_entry)
+  # כל העמודות נבנות בבת אחת במקום לולאה על 1000 רשומות
+  i = np.arange(1000)
+  
+  # הוספת וריאציה בזמן
+  timestamps = np.datetime64(base_time, "us") + (i // 10 * 60 + i % 60).astype("timedelta64[s]")
+  
+  # בחירת אירוע, עם אנומליות לדוגמה
+  conditions = [i % 50 == 0, i % 100 == 0]  # כל 50 רשומות, כל 100 רשומות
+  event = i % len(game_events)
+  
+  def event_column(field, anomaly_values):
+    """עמודה של שדה אירוע, עם ערכי האנומליות."""
+    values = np.array([e[field] for e in game_events])[event]
+    return np.select(conditions, anomaly_values, default=values)
+  
+  logs = pd.DataFrame({
+    "timestamp": np.datetime_as_string(timestamps, unit="us"),
+    "level": event_column("level", ["ERROR", "WARN"]),
+    "message": event_column("message", ["CRITICAL: Server overload", "Suspicious player behavior detected"]),
+    "status": event_column("status", [500, 200]),
+    "response_time": 0.1 + (i % 10) * 0.1,
+    "player_id": np.char.add("player_", (1000 + i).astype(str)),
+    "game_room": np.char.add("room_", (i % 10).astype(str)),
+    "ip_address": np.char.add("192.168.1.", (i % 254 + 1).astype(str)),
+    "user_agent": "GameClient/1.0"
+  })
   
   return logs
 
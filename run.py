@@ -2,19 +2,21 @@
 """Quick start script for LLM Integration Pipeline."""
 
 import subprocess
+import shutil
 import sys
 import os
 from pathlib import Path
 
 
 def run_command(command, description):
-  """Run a command and handle errors."""
+  """Run a command, given as an argument list, and handle errors."""
   print(f"🔄 {description}...")
   try:
-    result = subprocess.run(command, shell=True, check=True)
+    subprocess.run(command, check=True)
     print(f"✅ {description} completed")
     return True
-  except subprocess.CalledProcessError as e:
+  # Without a shell, a missing program raises instead of exiting with 127
+  except (subprocess.CalledProcessError, OSError) as e:
     print(f"❌ {description} failed: {e}")
     return False
 
@@ -33,21 +35,21 @@ def main():
   if not Path(".env").exists():
     print("⚠️ .env file not found. Creating from template...")
     if Path("env.example").exists():
-      run_command("cp env.example .env", "Creating .env file")
+      shutil.copyfile("env.example", ".env")
       print("📝 Please edit .env file with your API keys before continuing")
     else:
       print("❌ env.example file not found")
       sys.exit(1)
   
   # Check if Docker is running
-  if not run_command("docker --version", "Checking Docker"):
+  if not run_command(["docker", "--version"], "Checking Docker"):
     print("❌ Docker is not installed or not running")
     sys.exit(1)
   
   # Start the application
   print("\n🚀 Starting LLM Integration Pipeline...")
   
-  if run_command("docker-compose up -d", "Starting services"):
+  if run_command(["docker-compose", "up", "-d"], "Starting services"):
     print("\n🎉 LLM Integration Pipeline is starting up!")
     print("\n📊 Access points:")
     print("   • Web Dashboard: http://localhost:8000")
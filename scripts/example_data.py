@@ -1,17 +1,76 @@
 #!/usr/bin/env python3
 """Script to create example data for testing the LLM Integration Pipeline."""
 
-import json
-import random
 from datetime import datetime, timedelta
 from pathlib import Path
+import numpy as np
+import orjson
 
 
-def generate_log_data(num_entries=1000):
+# Sample schema and rows, kept as bytes so they are written without encoding
+EXAMPLE_SQL = b"""
+-- Example database schema and data for LLM Integration Pipeline
+
+CREATE TABLE IF NOT EXISTS user_activity (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    action VARCHAR(100) NOT NULL,
+    timestamp TIMESTAMP NOT NULL,
+    ip_address INET,
+    user_agent TEXT,
+    success BOOLEAN DEFAULT TRUE,
+    error_message TEXT
+);
+
+CREATE TABLE IF NOT EXISTS system_metrics (
+    id SERIAL PRIMARY KEY,
+    metric_name VARCHAR(100) NOT NULL,
+    metric_value DECIMAL(10,2) NOT NULL,
+    timestamp TIMESTAMP NOT NULL,
+    tags JSONB
+);
+
+-- Insert sample user activity data
+INSERT INTO user_activity (user_id, action, timestamp, ip_address, user_agent, success, error_message) VALUES
+(1001, 'login', NOW() - INTERVAL '1 hour', '192.168.1.100', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)', TRUE, NULL),
+(1002, 'purchase', NOW() - INTERVAL '2 hours', '192.168.1.101', 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)', TRUE, NULL),
+(1003, 'login', NOW() - INTERVAL '3 hours', '192.168.1.102', 'Mozilla/5.0 (X11; Linux x86_64)', FALSE, 'Invalid credentials'),
+(1001, 'logout', NOW() - INTERVAL '4 hours', '192.168.1.100', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)', TRUE, NULL),
+(1004, 'register', NOW() - INTERVAL '5 hours', '192.168.1.103', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)', TRUE, NULL);
+
+-- Insert sample system metrics
+INSERT INTO system_metrics (metric_name, metric_value, timestamp, tags) VALUES
+('cpu_usage', 45.2, NOW() - INTERVAL '1 hour', '{"host": "web-server-01", "environment": "production"}'),
+('memory_usage', 78.5, NOW() - INTERVAL '1 hour', '{"host": "web-server-01", "environment": "production"}'),
+('disk_usage', 32.1, NOW() - INTERVAL '1 hour', '{"host": "web-server-01", "environment": "production"}'),
+('response_time', 150.5, NOW() - INTERVAL '1 hour', '{"host": "web-server-01", "environment": "production", "endpoint": "/api/users"}'),
+('error_rate', 2.3, NOW() - INTERVAL '1 hour', '{"host": "web-server-01", "environment": "production"}');
+"""
+
+
+# Every IP and user id the example logs use, formatted once rather than per entry
+IPS = [f"192.168.1.{octet}" for octet in range(1, 255)]
+USER_IDS = [f"user_{user}" for user in range(1000, 10000)]
+
+
+def _pick(rng, values, size):
+  """Pick size random elements of values, reusing the value objects themselves."""
+  # Indexing an object array avoids building a new string for every entry
+  return np.array(values, dtype=object)[rng.integers(0, len(values), size)]
+
+
+def _pick_per_group(rng, groups, group_idx):
+  """Pick a random element of each entry's group, in one draw for all entries."""
+  sizes = np.array([len(group) for group in groups])
+  starts = np.cumsum(sizes) - sizes
+  flat = np.array([value for group in groups for value in group], dtype=object)
+  return flat[starts[group_idx] + rng.integers(0, sizes[group_idx])]
+
+
+def generate_log_data(data_dir, num_entries=1000):
   """Generate example log data."""
   print("📝 Generating example log data...")
   
-  log_entries = []
   base_time = datetime.now() - timedelta(hours=24)
   
   # Common log patterns
@@ -44,137 +103,105 @@ def generate_log_data(num_entries=1000):
   
   status_codes = [200, 201, 400, 401, 403, 404, 500, 502, 503]
   
-  for i in range(num_entries):
-    # Add some time variation
-    timestamp = base_time + timedelta(
-      minutes=random.randint(0, 1440),
-      seconds=random.randint(0, 59)
-    )
-    
-    # Determine log level and message
-    rand = random.random()
-    if rand < 0.05:  # 5% errors
-      level = "ERROR"
-      message = random.choice(error_messages)
-      status = random.choice([400, 401, 403, 404, 500, 502, 503])
-    elif rand < 0.15:  # 10% warnings
-      level = "WARN"
-      message = random.choice(warning_messages)
-      status = random.choice([200, 201, 400, 401])
-    else:  # 80% info
-      level = "INFO"
-      message = random.choice(info_messages)
-      status = random.choice([200, 201])
-    
-    # Generate some anomalies
-    if random.random() < 0.02:  # 2% chance of anomaly
-      # Spike in errors
-      if random.random() < 0.5:
-        level = "ERROR"
-        message = "CRITICAL: System overload detected"
-        status = 500
-      else:
-        # Unusual pattern
-        message = f"ANOMALY: Unusual request pattern detected - {random.randint(1000, 9999)} requests in 1 minute"
-        status = 429
-    
-    entry = {
-      "timestamp": timestamp.isoformat(),
+  endpoints = [
+    "/api/users",
+    "/api/orders",
+    "/api/products",
+    "/api/auth/login",
+    "/api/health",
+    "/api/metrics"
+  ]
+  
+  methods = ["GET", "POST", "PUT", "DELETE"]
+  
+  user_agents = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36"
+  ]
+  
+  # Every field is drawn for all entries at once rather than entry by entry
+  rng = np.random.default_rng()
+  
+  # Add some time variation, up to 24 hours and 59 seconds; the offsets are
+  # sorted up front, so entries are built in timestamp order
+  offsets = np.sort(rng.integers(0, 1441 * 60, num_entries)).astype("timedelta64[s]")
+  # Formatted in one call, in the same ISO 8601 form as datetime.isoformat()
+  timestamps = np.datetime_as_string(np.datetime64(base_time, "us") + offsets, unit="us").tolist()
+  
+  # Determine log level and message
+  rand = rng.random(num_entries)
+  level_idx = np.where(rand < 0.05, 0, np.where(rand < 0.15, 1, 2))  # 5% errors, 10% warnings, the rest info
+  levels = np.array(["ERROR", "WARN", "INFO"], dtype=object)[level_idx]
+  messages = _pick_per_group(rng, [error_messages, warning_messages, info_messages], level_idx)
+  statuses = _pick_per_group(rng, [[400, 401, 403, 404, 500, 502, 503], [200, 201, 400, 401], [200, 201]], level_idx)
+  
+  # Generate some anomalies (2%): half spikes in errors, half unusual patterns
+  anomalous = rng.random(num_entries) < 0.02
+  spike = anomalous & (rng.random(num_entries) < 0.5)
+  pattern = anomalous & ~spike
+  levels[spike] = "ERROR"
+  statuses[spike] = 500
+  statuses[pattern] = 429
+  messages[spike] = "CRITICAL: System overload detected"
+  messages[pattern] = [
+    f"ANOMALY: Unusual request pattern detected - {count} requests in 1 minute"
+    for count in rng.integers(1000, 10000, pattern.sum()).tolist()
+  ]
+  
+  log_entries = [
+    {
+      "timestamp": timestamp,
       "level": level,
       "message": message,
       "status": status,
-      "response_time": random.uniform(0.1, 2.0),
-      "ip": f"192.168.1.{random.randint(1, 254)}",
-      "user_id": f"user_{random.randint(1000, 9999)}",
-      "endpoint": random.choice([
-        "/api/users",
-        "/api/orders",
-        "/api/products",
-        "/api/auth/login",
-        "/api/health",
-        "/api/metrics"
-      ]),
-      "method": random.choice(["GET", "POST", "PUT", "DELETE"]),
-      "user_agent": random.choice([
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
-        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36"
-      ])
+      "response_time": response_time,
+      "ip": ip,
+      "user_id": user_id,
+      "endpoint": endpoint,
+      "method": method,
+      "user_agent": user_agent
     }
-    
-    log_entries.append(entry)
-  
-  # Sort by timestamp
-  log_entries.sort(key=lambda x: x["timestamp"])
+    for timestamp, level, message, status, response_time, ip, user_id, endpoint, method, user_agent in zip(
+      timestamps,
+      levels.tolist(),
+      messages.tolist(),
+      statuses.tolist(),
+      rng.uniform(0.1, 2.0, num_entries).tolist(),
+      _pick(rng, IPS, num_entries).tolist(),
+      _pick(rng, USER_IDS, num_entries).tolist(),
+      _pick(rng, endpoints, num_entries).tolist(),
+      _pick(rng, methods, num_entries).tolist(),
+      _pick(rng, user_agents, num_entries).tolist()
+    )
+  ]
   
   # Save to file
-  log_file = Path("data/example_logs.json")
-  log_file.parent.mkdir(exist_ok=True)
+  log_file = data_dir / "example_logs.json"
   
-  with open(log_file, "w") as f:
+  # Binary writes through a 256 KiB buffer, rather than the default 8 KiB text one
+  with open(log_file, "wb", buffering=256 * 1024) as f:
     for entry in log_entries:
-      f.write(json.dumps(entry) + "\n")
+      f.write(orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE))
   
   print(f"✅ Generated {num_entries} log entries in {log_file}")
   return log_file
 
 
-def generate_database_data():
+def generate_database_data(data_dir):
   """Generate example database data."""
   print("🗄️ Generating example database data...")
   
   # This would typically connect to a real database
   # For now, we'll create a SQL file with sample data
-  sql_file = Path("data/example_database.sql")
-  sql_file.parent.mkdir(exist_ok=True)
-  
-  sql_content = """
--- Example database schema and data for LLM Integration Pipeline
-
-CREATE TABLE IF NOT EXISTS user_activity (
-    id SERIAL PRIMARY KEY,
-    user_id INTEGER NOT NULL,
-    action VARCHAR(100) NOT NULL,
-    timestamp TIMESTAMP NOT NULL,
-    ip_address INET,
-    user_agent TEXT,
-    success BOOLEAN DEFAULT TRUE,
-    error_message TEXT
-);
-
-CREATE TABLE IF NOT EXISTS system_metrics (
-    id SERIAL PRIMARY KEY,
-    metric_name VARCHAR(100) NOT NULL,
-    metric_value DECIMAL(10,2) NOT NULL,
-    timestamp TIMESTAMP NOT NULL,
-    tags JSONB
-);
-
--- Insert sample user activity data
-INSERT INTO user_activity (user_id, action, timestamp, ip_address, user_agent, success, error_message) VALUES
-(1001, 'login', NOW() - INTERVAL '1 hour', '192.168.1.100', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)', TRUE, NULL),
-(1002, 'purchase', NOW() - INTERVAL '2 hours', '192.168.1.101', 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)', TRUE, NULL),
-(1003, 'login', NOW() - INTERVAL '3 hours', '192.168.1.102', 'Mozilla/5.0 (X11; Linux x86_64)', FALSE, 'Invalid credentials'),
-(1001, 'logout', NOW() - INTERVAL '4 hours', '192.168.1.100', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)', TRUE, NULL),
-(1004, 'register', NOW() - INTERVAL '5 hours', '192.168.1.103', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)', TRUE, NULL);
-
--- Insert sample system metrics
-INSERT INTO system_metrics (metric_name, metric_value, timestamp, tags) VALUES
-('cpu_usage', 45.2, NOW() - INTERVAL '1 hour', '{"host": "web-server-01", "environment": "production"}'),
-('memory_usage', 78.5, NOW() - INTERVAL '1 hour', '{"host": "web-server-01", "environment": "production"}'),
-('disk_usage', 32.1, NOW() - INTERVAL '1 hour', '{"host": "web-server-01", "environment": "production"}'),
-('response_time', 150.5, NOW() - INTERVAL '1 hour', '{"host": "web-server-01", "environment": "production", "endpoint": "/api/users"}'),
-('error_rate', 2.3, NOW() - INTERVAL '1 hour', '{"host": "web-server-01", "environment": "production"}');
-"""
-  
-  with open(sql_file, "w") as f:
-    f.write(sql_content)
+  sql_file = data_dir / "example_database.sql"
+  sql_file.write_bytes(EXAMPLE_SQL)
   
   print(f"✅ Generated database schema and sample data in {sql_file}")
   return sql_file
 
 
-def create_example_configs():
+def create_example_configs(data_dir):
   """Create example configuration files."""
   print("⚙️ Creating example configurations...")
   
@@ -208,13 +235,12 @@ def create_example_configs():
     }
   }
   
-  config_dir = Path("data/configs")
-  config_dir.mkdir(exist_ok=True)
+  config_dir = data_dir / "configs"
+  config_dir.mkdir(parents=True, exist_ok=True)
   
   for filename, config in configs.items():
     config_file = config_dir / filename
-    with open(config_file, "w") as f:
-      json.dump(config, f, indent=2)
+    config_file.write_bytes(orjson.dumps(config, option=orjson.OPT_INDENT_2))
     print(f"✅ Created {config_file}")
   
   return config_dir
@@ -226,12 +252,13 @@ def main():
   print("=" * 50)
   
   # Create data directory
-  Path("data").mkdir(exist_ok=True)
+  data_dir = Path("data")
+  data_dir.mkdir(parents=True, exist_ok=True)
   
   # Generate example data
-  generate_log_data(1000)
-  generate_database_data()
-  create_example_configs()
+  generate_log_data(data_dir, 1000)
+  generate_database_data(data_dir)
+  create_example_configs(data_dir)
   
   print("\n🎉 Example data generation completed!")
   print("\nGenerated files:")
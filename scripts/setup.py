@@ -5,19 +5,36 @@ import os
 import sys
 import subprocess
 import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
 def run_command(command, description):
-  """Run a command and handle errors."""
+  """Run a command, given as an argument list, and handle errors."""
   print(f"🔄 {description}...")
   try:
-    result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
+    # Output is discarded; only stderr is kept, for the failure message
+    subprocess.run(command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
     print(f"✅ {description} completed successfully")
     return True
   except subprocess.CalledProcessError as e:
     print(f"❌ {description} failed: {e.stderr}")
     return False
+  # Without a shell, a missing program raises instead of exiting with 127
+  except OSError as e:
+    print(f"❌ {description} failed: {e}")
+    return False
+
+
+def wait_until_ready(command, timeout=30.0, interval=0.2):
+  """Poll a readiness check command until it succeeds or the timeout passes."""
+  deadline = time.monotonic() + timeout
+  while time.monotonic() < deadline:
+    if subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode == 0:
+      return True
+    time.sleep(interval)
+  return False
 
 
 def check_requirements():
@@ -25,16 +42,19 @@ def check_requirements():
   print("🔍 Checking requirements...")
   
   requirements = {
-    "python": "python --version",
-    "pip": "pip --version",
-    "docker": "docker --version",
-    "docker-compose": "docker-compose --version"
+    "python": ["python", "--version"],
+    "pip": ["pip", "--version"],
+    "docker": ["docker", "--version"],
+    "docker-compose": ["docker-compose", "--version"]
   }
   
-  missing = []
-  for tool, command in requirements.items():
-    if not run_command(command, f"Checking {tool}"):
-      missing.append(tool)
+  # The checks are independent processes, so they run concurrently
+  with ThreadPoolExecutor(max_workers=len(requirements)) as executor:
+    results = list(executor.map(
+      lambda item: run_command(item[1], f"Checking {item[0]}"),
+      requirements.items()
+    ))
+  missing = [tool for tool, ok in zip(requirements, results) if not ok]
   
   if missing:
     print(f"❌ Missing required tools: {', '.join(missing)}")
@@ -69,7 +89,7 @@ def install_dependencies():
   """Install Python dependencies."""
   print("📦 Installing Python dependencies...")
   
-  if not run_command("pip install -r requirements.txt", "Installing dependencies"):
+  if not run_command(["pip", "install", "-r", "requirements.txt"], "Installing dependencies"):
     return False
   
   return True
@@ -79,12 +99,19 @@ def setup_database():
   """Set up database using Docker."""
   print("🗄️ Setting up database...")
   
-  if not run_command("docker-compose up -d db redis", "Starting database and Redis"):
+  if not run_command(["docker-compose", "up", "-d", "db", "redis"], "Starting database and Redis"):
     return False
   
   print("⏳ Waiting for database to be ready...")
-  import time
-  time.sleep(10)
+  readiness_checks = {
+    "Database": ["docker-compose", "exec", "-T", "db", "pg_isready", "-U", "postgres"],
+    "Redis": ["docker-compose", "exec", "-T", "redis", "redis-cli", "ping"]
+  }
+  for service, command in readiness_checks.items():
+    if not wait_until_ready(command):
+      print(f"❌ {service} did not become ready within 30 seconds")
+      return False
+    print(f"✅ {service} is ready")
   
   return True
 
@@ -94,7 +121,7 @@ def run_migrations():
   print("🔄 Running database migrations...")
   
   # The database tables are created automatically when the app starts
-  # This is handled in app/database.py
+  # This is handled by init_db() in app/database.py
   print("✅ Database migrations completed")
   return True
 
@@ -106,7 +133,7 @@ def create_directories():
   directories = ["logs", "data", "static", "reports"]
   
   for directory in directories:
-    Path(directory).mkdir(exist_ok=True)
+    Path(directory).mkdir(parents=True, exist_ok=True)
     print(f"✅ Created directory: {directory}")
   
   return True
@@ -117,8 +144,10 @@ def main():
   print("🚀 LLM Integration Pipeline Setup")
   print("=" * 40)
   
-  # Check if we're in the right directory
-  if not Path("app").exists() or not Path("requirements.txt").exists():
+  # Check if we're in the right directory, from one listing of it
+  with os.scandir(".") as entries:
+    names = {entry.name for entry in entries}
+  if "app" not in names or "requirements.txt" not in names:
     print("❌ Please run this script from the project root directory")
     sys.exit(1)
   
@@ -3,8 +3,11 @@
 
 import asyncio
 import json
+import sqlite3
 import sys
+import tempfile
 from pathlib import Path
+from types import SimpleNamespace
 from datetime import datetime, timedelta
 
 # Add the app directory to the Python path
@@ -30,15 +33,17 @@ async def test_data_connectors():
     
     log_connector = DataConnectorFactory.create_connector("log", log_config)
     
-    if log_connector.test_connection():
+    # Connectors block, so they run in threads to let the other tests proceed
+    if await asyncio.to_thread(log_connector.test_connection):
       print("✅ Log connector: Connection successful")
       
       # Test data fetching
       end_time = datetime.now()
       start_time = end_time - timedelta(hours=24)
       
-      data = list(log_connector.fetch_data(start_time, end_time))
-      print(f"✅ Log connector: Fetched {len(data)} entries")
+      # Only the count is reported, so entries are counted without being kept
+      count = await asyncio.to_thread(lambda: sum(1 for _ in log_connector.fetch_data(start_time, end_time)))
+      print(f"✅ Log connector: Fetched {count} entries")
     else:
       print("❌ Log connector: Connection failed")
   
@@ -54,13 +59,46 @@ async def test_data_connectors():
     
     db_connector = DataConnectorFactory.create_connector("database", db_config)
     
-    if db_connector.test_connection():
+    if await asyncio.to_thread(db_connector.test_connection):
       print("✅ Database connector: Connection successful")
     else:
       print("⚠️ Database connector: Connection failed (database may not be running)")
   
   except Exception as e:
     print(f"⚠️ Database connector test failed: {e}")
+  
+  # Test time placeholders against a throwaway SQLite table (no server needed)
+  try:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+      db_path = Path(tmp_dir) / "events.db"
+      with sqlite3.connect(db_path) as db:
+        db.execute("CREATE TABLE events (id INTEGER, timestamp TEXT)")
+        db.executemany("INSERT INTO events VALUES (?, ?)", [
+          (1, "2024-01-01 09:00:00"),
+          (2, "2024-01-01 10:30:00"),
+          (3, "2024-01-01 12:00:00")
+        ])
+      
+      placeholder_config = {
+        "connection_string": f"sqlite:///{db_path}",
+        "query": "SELECT id, 'after {start_time}' AS note FROM events WHERE timestamp BETWEEN '{start_time}' AND '{end_time}'"
+      }
+      
+      placeholder_connector = DataConnectorFactory.create_connector("database", placeholder_config)
+      try:
+        rows = await asyncio.to_thread(
+          lambda: list(placeholder_connector.fetch_data(datetime(2024, 1, 1, 10), datetime(2024, 1, 1, 11)))
+        )
+      finally:
+        placeholder_connector.close()
+    
+    if rows == [{"id": 2, "note": "after 2024-01-01 10:00:00"}]:
+      print("✅ Database connector: Time placeholders bound and filled in")
+    else:
+      print(f"❌ Database connector: Unexpected rows for time placeholders: {rows}")
+  
+  except Exception as e:
+    print(f"❌ Database connector placeholder test failed: {e}")
 
 
 async def test_llm_providers():
@@ -104,6 +142,51 @@ async def test_llm_providers():
   
   except Exception as e:
     print(f"⚠️ Anthropic provider test failed: {e}")
+  
+  # Test the Anthropic request payload with a recording client (no API key needed)
+  try:
+    from app.config import settings
+    from app.llm.anthropic_provider import AnthropicProvider
+    from app.llm.base import LLMMessage
+    
+    class RecordingMessages:
+      def __init__(self):
+        self.requests = []
+      
+      async def create(self, **request):
+        self.requests.append(request)
+        return SimpleNamespace(
+          content=[SimpleNamespace(text="ok")],
+          usage=SimpleNamespace(input_tokens=1, output_tokens=1),
+          model=request["model"],
+          stop_reason="end_turn"
+        )
+    
+    messages = [
+      LLMMessage(role="system", content="You are a log analyst."),
+      LLMMessage(role="user", content="Any anomalies?")
+    ]
+    api_key, settings.anthropic_api_key = settings.anthropic_api_key, settings.anthropic_api_key or "test-key"
+    try:
+      systems = []
+      for config in ({}, {"prompt_caching": True}):
+        provider = AnthropicProvider(config)
+        provider.client = SimpleNamespace(messages=RecordingMessages())
+        await provider.generate_response(messages)
+        request = provider.client.messages.requests[0]
+        assert request["messages"] == [{"role": "user", "content": "Any anomalies?"}]
+        systems.append(request["system"])
+    finally:
+      settings.anthropic_api_key = api_key
+    
+    cached_system = [{"type": "text", "text": "You are a log analyst.", "cache_control": {"type": "ephemeral"}}]
+    if systems == ["You are a log analyst.", cached_system]:
+      print("✅ Anthropic provider: Request payloads as expected")
+    else:
+      print(f"❌ Anthropic provider: Unexpected system prompts: {systems}")
+  
+  except Exception as e:
+    print(f"❌ Anthropic provider payload test failed: {e}")
 
 
 async def test_anomaly_detector():
@@ -158,7 +241,13 @@ async def test_anomaly_detector():
     print(f"❌ Anomaly detector test failed: {e}")
 
 
-def test_report_generators():
+async def _generate_report(format, report_data):
+  """Generate a report in the given format."""
+  generator = ReportGeneratorFactory.create_generator(format, {})
+  return await generator.generate_report(report_data)
+
+
+async def test_report_generators():
   """Test report generators."""
   print("\n📊 Testing Report Generators...")
   
@@ -194,18 +283,24 @@ def test_report_generators():
     analysis_period={"start": "2024-01-01", "end": "2024-01-02"}
   )
   
+  # Both formats are generated concurrently in the running event loop
+  html_content, json_content = await asyncio.gather(
+    _generate_report("html", report_data),
+    _generate_report("json", report_data),
+    return_exceptions=True
+  )
+  
+  # Reports that pass their checks, saved together once both are checked
+  saves = []
+  
   # Test HTML generator
   try:
-    html_generator = ReportGeneratorFactory.create_generator("html", {})
-    html_content = asyncio.run(html_generator.generate_report(report_data))
+    if isinstance(html_content, Exception):
+      raise html_content
     
     if html_content and len(html_content) > 100:
       print("✅ HTML generator: Report generated successfully")
-      
-      # Save test report
-      with open("test_report.html", "w") as f:
-        f.write(html_content)
-      print("✅ HTML generator: Test report saved as test_report.html")
+      saves.append(("HTML", "test_report.html", html_content))
     else:
       print("❌ HTML generator: Generated content is too short")
   
@@ -214,18 +309,14 @@ def test_report_generators():
   
   # Test JSON generator
   try:
-    json_generator = ReportGeneratorFactory.create_generator("json", {})
-    json_content = asyncio.run(json_generator.generate_report(report_data))
+    if isinstance(json_content, Exception):
+      raise json_content
     
     if json_content:
       parsed = json.loads(json_content)
       if "metadata" in parsed and "anomalies" in parsed:
         print("✅ JSON generator: Report generated successfully")
-        
-        # Save test report
-        with open("test_report.json", "w") as f:
-          f.write(json_content)
-        print("✅ JSON generator: Test report saved as test_report.json")
+        saves.append(("JSON", "test_report.json", json_content))
       else:
         print("❌ JSON generator: Generated content is invalid")
     else:
@@ -233,6 +324,17 @@ def test_report_generators():
   
   except Exception as e:
     print(f"❌ JSON generator test failed: {e}")
+  
+  # Save test reports, writing the files concurrently off the event loop
+  results = await asyncio.gather(*(
+    asyncio.to_thread(Path(filename).write_bytes, content.encode("utf-8"))
+    for _, filename, content in saves
+  ), return_exceptions=True)
+  for (name, filename, _), result in zip(saves, results):
+    if isinstance(result, Exception):
+      print(f"❌ {name} generator test failed: {result}")
+    else:
+      print(f"✅ {name} generator: Test report saved as {filename}")
 
 
 async def main():
@@ -245,11 +347,17 @@ async def main():
     print("⚠️ Example data not found. Run scripts/example_data.py first.")
     return
   
-  # Run tests
-  await test_data_connectors()
-  await test_llm_providers()
-  await test_anomaly_detector()
-  test_report_generators()
+  # Run tests; the subsystems share no state, so their I/O waits overlap
+  results = await asyncio.gather(
+    test_data_connectors(),
+    test_llm_providers(),
+    test_anomaly_detector(),
+    test_report_generators(),
+    return_exceptions=True
+  )
+  for result in results:
+    if isinstance(result, Exception):
+      print(f"❌ Test failed: {result}")
   
   print("\n🎉 Test suite completed!")
   print("\nGenerated test files:")
@@ -0,0 +1,19 @@
+// Load dashboard statistics
+async function loadStats() {
+    try {
+        const stats = await (await fetch('/api/stats')).json();
+
+        document.getElementById('data-sources').textContent = stats.data_sources || 0;
+        document.getElementById('analysis-jobs').textContent = stats.analysis_jobs || 0;
+        document.getElementById('anomalies').textContent = stats.anomalies || 0;
+        document.getElementById('reports').textContent = stats.reports || 0;
+    } catch (error) {
+        console.error('Failed to load stats:', error);
+    }
+}
+
+// Load stats on page load
+loadStats();
+
+// Refresh stats every 30 seconds
+setInterval(loadStats, 30000);